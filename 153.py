@@ -1,70 +1,50 @@
+from math import isqrt
 
-from sympy import gcd
+import numpy as np
 
-def fast_sum_series(N, norm, a):
-    total = 0
-    max_k = N // norm
-    
-    # Group by the value of floor(N/(norm*k))
-    v = 1
-    while v <= max_k:
-        # Find range of k where floor(N/(norm*k)) = v
-        # This happens when: v <= N/(norm*k) < v+1
-        # Rearranging: N/(v+1) < norm*k <= N/v
-        # So: N/((v+1)*norm) < k <= N/(v*norm)
-        
-        L = max(1, N // ((v + 1) * norm) + 1)
-        R = min(max_k, N // (v * norm))
-        
-        if L <= R:
-            # Sum of k from L to R is (R-L+1)*(L+R)/2
-            sum_k = (R - L + 1) * (L + R) // 2
-            total += 2 * a * v * sum_k
-            
-        v += 1
-    
-    return total
+from pe_blocksum import block_sum, block_sum_many
+
+def merge_weights(keys, weights):
+    """Sum the weights of equal keys"""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    summed = np.zeros(len(unique), dtype=np.int64)
+    np.add.at(summed, inverse, weights)
+    return unique, summed
 
 def sum_gaussian_divisors_real_parts_optimized(N):
-    total = 0
-    
-    # Add regular integer divisors
-    for n in range(1, N + 1):
-        total += (N//n)*n
+    # Add regular integer divisors: sum_n n * floor(N/n)
+    total = block_sum(N, f=1, weight=1)
     
     # Add contributions from non-real Gaussian integers
     print(total)
-    limit = int(N ** 0.5) + 1
+    limit = isqrt(N)
     
-    count = 0
+    # Every primitive a+bi (a <= b, a^2 + b^2 <= N) contributes
+    # 2 * (a+b) * G(N // norm) with G(M) = sum_{k<=M} k*floor(M/k);
+    # for a == b (only 1+i) the divisors are a+ai, a-ai and it is 2a.
+    # Collect the weight per M, then evaluate every distinct M in one batch.
+    keys = np.zeros(0, dtype=np.int64)
+    weights = np.zeros(0, dtype=np.int64)
+    buffered_keys, buffered_weights, buffered = [], [], 0
     for a in range(1, limit + 1):
         if a%1000 == 0:
             print("Done ", a)
-        print(a)
-        for b in range(a, limit + 1):
-            if a > b:  # Avoid double counting (a,b) and (b,a)
-                continue
-            count += 1
-
-            if gcd(a, b) != 1:
-                continue
-                
-            norm = a*a + b*b
-            if norm > N:
-                break
-            
-            #print("For norm ", norm, " multiples", multiples)
-            
-            if a == b:
-                # Divisors: a+ai, a-ai
-                #total += 2 * a * multiples
-                total += fast_sum_series(N, norm, a)
-            else:
-                # Divisors: a+bi, a-bi, b+ai, b-ai  
-                total += fast_sum_series(N, norm, a+b)
-            #print("Norm", norm, total)
+        b = np.arange(a, isqrt(max(N - a * a, 0)) + 1, dtype=np.int64)
+        b = b[np.gcd(a, b) == 1]
+        if len(b) == 0:
+            continue
+        buffered_keys.append(N // (a * a + b * b))
+        buffered_weights.append(np.where(b == a, 2 * a, 2 * (a + b)))
+        buffered += len(b)
+        if buffered >= 1 << 20:
+            keys, weights = merge_weights(np.concatenate([keys] + buffered_keys),
+                                          np.concatenate([weights] + buffered_weights))
+            buffered_keys, buffered_weights, buffered = [], [], 0
+    keys, weights = merge_weights(np.concatenate([keys] + buffered_keys),
+                                  np.concatenate([weights] + buffered_weights))
     
-    #print(count)
+    series = block_sum_many(keys, f=1, weight=1)
+    total += int(np.dot(weights.astype(object), series))
     return total
 
 # Test
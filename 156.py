@@ -1,5 +1,9 @@
+import multiprocessing as mp
+
 from matplotlib import pyplot as plt
 
+from pe_digitdp import digit_dp
+
 def count_d(d, digit):
     return sum([r == digit for r in str(d)])
 
@@ -35,56 +39,49 @@ def solve(n, d):
 
     return ans
 
-def binary_search_fixed_points(d, start, end, found_points=None):
+def solve_dp(n, d):
+    """solve(n, d) declared as a digit DP: the state is the count of d so far."""
+    return digit_dp(None, (0,), lambda position, state, digit: (state[0] + (digit == d),),
+                    lambda state: state[0], upper=n)
+
+def search_block(d, prefix, prefix_count, k, f_before, max_range, found_points):
     """
-    Simple binary search to find all fixed points where solve(n, d) == n
+    Collect the fixed points n <= max_range of solve(n, d) in the aligned block
+    prefix*10^k .. prefix*10^k + 10^k - 1 and return solve(end of block, d).
+
+    f_before = solve(start - 1, d) is handed over from the previous sibling,
+    and the block's own count comes from its digit decomposition: every
+    number in it repeats the prefix (prefix_count copies of d), and the free
+    k low digits contain d k * 10^(k-1) times in total.  Since solve is
+    non-decreasing, a fixed point n in the block needs
+    max(start, f_before) <= n <= min(end, f_end), so whole blocks are
+    skipped whenever that range is empty.
     """
-    if found_points is None:
-        found_points = []
-    
-    # Base case: if range is small enough, check each number
-    if end - start <= 1000:
-        for n in range(max(1, start), end + 1):
-            if solve(n, d) == n:
-                found_points.append(n)
-        return found_points
-    
-    # Check endpoints
-    if start >= 1 and solve(start, d) == start:
-        found_points.append(start)
-    if solve(end, d) == end:
-        found_points.append(end)
-    
-    # Calculate midpoint and check it
-    mid = (start + end) // 2
-    if solve(mid, d) == mid:
-        found_points.append(mid)
-    
-    # Calculate differences to decide whether to search each half
-    f_start = solve(start, d) - start if start >= 1 else -start
-    f_mid = solve(mid, d) - mid
-    f_end = solve(end, d) - end
-    
-    # Search left half if there might be a crossing
-    if f_start * f_mid <= 0 or abs(f_start) < (mid - start) or abs(f_mid) < (mid - start):
-        binary_search_fixed_points(d, start, mid, found_points)
-    
-    # Search right half if there might be a crossing
-    if f_mid * f_end <= 0 or abs(f_mid) < (end - mid) or abs(f_end) < (end - mid):
-        binary_search_fixed_points(d, mid, end, found_points)
-    
-    return found_points
+    size = 10**k
+    start = prefix*size
+    end = start + size - 1
+    f_end = f_before + size*prefix_count + k*size//10
+    if start > max_range or max(start, f_before) > min(end, f_end):
+        return f_end
+    if k == 0:
+        if start >= 1 and f_end == start:
+            found_points.append(start)
+        return f_end
+    f = f_before
+    for digit in range(10):
+        f = search_block(d, prefix*10 + digit, prefix_count + (digit == d), k - 1, f,
+                         max_range, found_points)
+    return f_end
 
 def find_all_fixed_points(d, max_range=10**12):
     """
-    Find all fixed points for digit d up to max_range using binary search
+    Find all fixed points for digit d up to max_range by branch and bound
+    over decimal blocks
     """
     print(f"Finding fixed points for d = {d} up to {max_range}...")
     
-    fixed_points = binary_search_fixed_points(d, 1, max_range)
-    
-    # Remove duplicates and sort
-    fixed_points = sorted(list(set(fixed_points)))
+    fixed_points = []
+    search_block(d, 0, 0, len(str(max_range)), 0, max_range, fixed_points)
     
     # Verify all found points
     verified_points = []
@@ -96,15 +93,21 @@ def find_all_fixed_points(d, max_range=10**12):
     return verified_points
 
 if __name__ == "__main__":
+    for n in (0, 9, 199981, 10**11 + 12345):
+        assert all(solve(n, d) == solve_dp(n, d) for d in range(1, 10))
+
+    # The nine digits are independent searches, one process each
+    with mp.Pool(min(9, mp.cpu_count())) as pool:
+        per_digit = pool.map(find_all_fixed_points, range(1, 10))
+
     total_sum = 0
     all_results = {}
     
-    for d in range(1, 10):
+    for d, fixed_points in zip(range(1, 10), per_digit):
         print(f"\n{'='*50}")
-        print(f"Processing digit d = {d}")
+        print(f"Digit d = {d}")
         print(f"{'='*50}")
         
-        fixed_points = find_all_fixed_points(d, max_range=10**12)
         digit_sum = sum(fixed_points)
         
         all_results[d] = {
@@ -1,16 +1,22 @@
-from math import ceil
-def ceil(n):
-    if n%2!=0:
-        return n/2+1
-    return n/2
+from pe_digitdp import digit_dp
 
-res = 0
 DIGS = 4
-for i in range(10**(DIGS-1), 10**DIGS):
-    s = map(int,str(i))
-    if s[0] +s[1] == s[2] + s[3]:
-        print s
-        print i
-        res += i
 
-print res
+def balanced_sum(digs):
+    """
+    Sum of the digs-digit numbers whose first and last ceil(digs/2) digits
+    have equal sums.  The state is that difference alone; an odd middle
+    digit sits in both halves and cancels.
+    """
+    half = digs // 2
+    def transition(position, state, digit):
+        if digs % 2 and position == half:
+            return state
+        return (state[0] + (digit if position < half else -digit),)
+    def digits(position):
+        return range(1, 10) if position == digs - 1 else range(10)
+    return digit_dp(digs, (0,), transition, lambda state: state[0] == 0,
+                    digits=digits, with_sum=True)[1]
+
+res = balanced_sum(DIGS)
+print(res)
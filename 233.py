@@ -1,6 +1,7 @@
 from math import gcd, isqrt
 from collections import Counter
-import sympy
+
+from pe_factor import factorint
 
 def count_representations(n, method="direct"):
     """Count the number of ways to express n as a sum of two squares."""
@@ -21,7 +22,7 @@ def count_representations(n, method="direct"):
             return 1
         
         # Get prime factorization
-        factors = sympy.factorint(n)
+        factors = factorint(n)
         
         # Apply the formula for number of representations
         result = 1
@@ -1,38 +1,7 @@
 import numpy as np 
 
+from pe_matrix import mat_pow_vec_mod
 
-def matrix_power(matrix, power, modulus=None):
-    """
-    Compute matrix^power efficiently using binary exponentiation.
-    Uses arbitrary precision integers to avoid overflow.
-    """
-    if power == 0:
-        # Return identity matrix of same size as input
-        identity = np.eye(matrix.shape[0], dtype=object)
-        for i in range(matrix.shape[0]):
-            identity[i, i] = int(1)  # Ensure it's a Python int
-        return identity
-    
-    if power == 1:
-        return matrix.copy()
-        
-    # Binary exponentiation
-    half = matrix_power(matrix, power // 2, modulus)
-    
-    if power % 2 == 0:
-        # power is even: result = half² 
-        if modulus:
-            result = np.matmul(half, half) % modulus
-        else:
-            result = np.matmul(half, half)
-    else:
-        # power is odd: result = half² * matrix
-        if modulus:
-            result = np.matmul(np.matmul(half, half) % modulus, matrix) % modulus
-        else:
-            result = np.matmul(np.matmul(half, half), matrix)
-            
-    return result
 
 def make_matrix():
     matrix = np.zeros((4, 4), dtype=np.int64)
@@ -48,4 +17,5 @@ M = make_matrix()
 
 initial = np.array([8, 4, 1, 1])
 
-print((initial @ matrix_power(M, 10**12 - 4, 10**8))[0]%(10**8))
\ No newline at end of file
+# initial @ M^k is the row-vector form, i.e. (M^T)^k @ initial
+print(mat_pow_vec_mod(M.T, 10**12 - 4, initial, 10**8)[0])
\ No newline at end of file
@@ -1,64 +1,53 @@
-
-N = 6
-maxX = 2**N
-maxY = 2**N
-
-originX = 2**(N-1)
-originY = 2**(N-1)
-
-def incircle(x, y):
-    return (x-originX)**2 + (y-originY)**2 <= 2**(2*N-2)
-
-def solve(x, y, l):
-
-    if l == 1:
-        #return 0
-        if incircle(x, y):
-            return 2
-        else:
-            return 2
-
-    r = l//2
-
-    all_black = True 
-    all_white = True 
-    #print("Searching pixels", x-r, x+r, y-r, y+r)
-    points = [(x-r, y+r-1), (x-r, y-r), (x+r-1, y+r-1), (x+r-1, y-r)]
-
-    #for xp in range(x-r, x+r):
-    #    for yp in range(y-r, y+r):
-    #        if incircle(xp, yp):
-    #            all_white = False
-    #        else:
-    #            all_black = False
-
-    if not(all(incircle(p[0],p[1]) for p in points)):
-        all_black = False
-
-    if not(all(not incircle(p[0],p[1]) for p in points)) or l == maxX:
-        all_white = False
-
-    #points = [(x+r, y+r), (x+r, y-r), (x-r, y-r), (x-r, y+r)]
-    if all_black or all_white:
-        return 2
-
-    a1 = solve(x + l//4, y + l//4, r)
-    a2 = solve(x - l//4, y + l//4, r)
-    a3 = solve(x + l//4, y - l//4, r)
-    a4 = solve(x - l//4, y - l//4, r)
-
-    #print("ans", x, y, l, a1, a2, a3, a4)
-
-    return 1 + a1 + a2 + a3 + a4
-    
-
-
-for i in range(24, 25):
-    N = i
-    maxX = 2**N
-    maxY = 2**N
-
-    originX = 2**(N-1)
-    originY = 2**(N-1)
-
-    print(solve(originX, originY, maxX))
\ No newline at end of file
+import numpy as np
+
+N = 24
+CHUNK = 1 << 20
+
+
+def encoding_length(N, chunk=CHUNK):
+    """
+    Length of the quadtree encoding of the 2^N x 2^N image of the disc
+    (x - 2^(N-1))^2 + (y - 2^(N-1))^2 <= 2^(2N-2).
+
+    Quadrants are handled a whole level at a time as arrays of centres: a
+    block with half-size r covers [x - r, x + r - 1] x [y - r, y + r - 1]; it
+    is all black when its farthest corner is inside the disc and all white
+    when its nearest point is outside.  Uniform blocks cost 2 bits, the rest
+    1 bit plus their four children, and only those mixed blocks (which hug
+    the circle) move on.  Levels larger than chunk are split and finished
+    one piece at a time, so memory follows the boundary, not the image.
+    """
+    origin = 2**(N-1)
+    radius2 = 2**(2*N-2)
+    total = 0
+    stack = [(np.array([origin], dtype=np.int64), np.array([origin], dtype=np.int64), 2**N)]
+    while stack:
+        x, y, l = stack.pop()
+        if x.size > chunk:
+            stack.extend((x[i:i + chunk], y[i:i + chunk], l) for i in range(0, x.size, chunk))
+            continue
+        if l == 1:
+            total += 2*x.size
+            continue
+        r = l//2
+        lo_x, hi_x, lo_y, hi_y = x - r - origin, x + r - 1 - origin, y - r - origin, y + r - 1 - origin
+        far_x = np.maximum(np.abs(lo_x), np.abs(hi_x))
+        far_y = np.maximum(np.abs(lo_y), np.abs(hi_y))
+        near_x = np.clip(0, lo_x, hi_x)
+        near_y = np.clip(0, lo_y, hi_y)
+        black = far_x*far_x + far_y*far_y <= radius2
+        white = near_x*near_x + near_y*near_y > radius2
+        mixed = ~(black | white)
+        n_mixed = int(mixed.sum())
+        total += 2*(x.size - n_mixed) + n_mixed
+        if l == 2:
+            # Children are single pixels: 2 bits each
+            total += 8*n_mixed
+            continue
+        x, y, q = x[mixed], y[mixed], l//4
+        stack.append((np.concatenate([x + q, x - q, x + q, x - q]),
+                      np.concatenate([y + q, y + q, y - q, y - q]), r))
+    return total
+
+
+print(encoding_length(N))
@@ -1,4 +1,6 @@
-from functools import cache
+import numpy as np
+
+from pe_digitdp import digit_dp
 
 N = 18
 
@@ -10,33 +12,31 @@ def digit_sum(n):
 
     return count
 
-@cache
-def solve(idx, carry_in, s_n, s_137n):
-
-    if idx == N:
-        if s_137n + digit_sum(carry_in) == s_n:
-            return 1
-        return 0
-
-    
-    ans = 0
-    for digit in range(10):
-        new_value = carry_in + digit*137
-        new_137_n = s_137n + new_value%10
-        new_carry = new_value//10
-
-        new_sn = s_n + digit
+def carry_digit_sum(carry):
+    """digit_sum over an int64 array of leftover carries."""
+    total = np.zeros_like(carry)
+    while carry.any():
+        total += carry % 10
+        carry = carry // 10
+    return total
 
-        ans += solve(idx+1, new_carry, new_sn, new_137_n)
+def transition(position, state, digit):
+    # Multiply by 137 least significant digit first; only s_n - s_137n matters
+    carry, diff = state
+    value = carry + digit*137
+    return value//10, diff + digit - value%10
 
-    return ans
+def solve(n_digits):
+    """Count of n < 10^n_digits with digit_sum(n) == digit_sum(137 n)."""
+    return digit_dp(n_digits, (0, 0), transition,
+                    lambda state: state[1] == carry_digit_sum(state[0]))
 
 
-print(solve(0, 0, 0, 0))
+print(solve(N))
 
 total = 0
 for i in range(1000000):
     if digit_sum(i) == digit_sum(137*i):
         total+=1
 
-print(total)
\ No newline at end of file
+print(total)
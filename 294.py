@@ -1,6 +1,8 @@
 import numpy as np
 from typing import List
 
+from pe_matrix import mat_pow_mod, mat_pow_vec_mod
+
 class NumberCounter:
     def __init__(self, target_sum=23, divisor=23):
         self.target_sum = target_sum
@@ -150,35 +152,9 @@ class NumberCounter:
     def matrix_power(self, matrix, power, modulus=None):
         """
         Compute matrix^power efficiently using binary exponentiation.
-        Uses arbitrary precision integers to avoid overflow.
+        Exact (object dtype) without a modulus, int64 limbs with one.
         """
-        if power == 0:
-            # Return identity matrix of same size as input
-            identity = np.eye(matrix.shape[0], dtype=object)
-            for i in range(matrix.shape[0]):
-                identity[i, i] = int(1)  # Ensure it's a Python int
-            return identity
-        
-        if power == 1:
-            return matrix.copy()
-            
-        # Binary exponentiation
-        half = self.matrix_power(matrix, power // 2, modulus)
-        
-        if power % 2 == 0:
-            # power is even: result = half² 
-            if modulus:
-                result = np.matmul(half, half) % modulus
-            else:
-                result = np.matmul(half, half)
-        else:
-            # power is odd: result = half² * matrix
-            if modulus:
-                result = np.matmul(np.matmul(half, half) % modulus, matrix) % modulus
-            else:
-                result = np.matmul(np.matmul(half, half), matrix)
-                
-        return result
+        return mat_pow_mod(matrix, power, modulus)
         
     def count_cumulative_sum_large(self, max_digits: int, modulus=None) -> int:
         """
@@ -214,35 +190,8 @@ class NumberCounter:
             return int(initial_vector[accumulator_idx])
         
         # For larger D, use matrix exponentiation
-        # We need to compute M^(max_digits-1) * v
-        if modulus:
-            # Make a copy of the matrix with modular values
-            mod_matrix = self.transition_matrix.copy()
-            for i in range(matrix_size):
-                for j in range(matrix_size):
-                    if mod_matrix[i, j] != 0:
-                        mod_matrix[i, j] = int(mod_matrix[i, j]) % modulus
-            
-            # Compute the power using binary exponentiation
-            powered_matrix = self.matrix_power(mod_matrix, max_digits-1, modulus)
-            
-            # Apply to initial vector
-            result_vector = np.zeros_like(initial_vector)
-            for i in range(matrix_size):
-                for j in range(matrix_size):
-                    if powered_matrix[i, j] != 0 and initial_vector[j] != 0:
-                        value = (int(powered_matrix[i, j]) * int(initial_vector[j])) % modulus
-                        result_vector[i] = (int(result_vector[i]) + value) % modulus
-        else:
-            # Use binary exponentiation with arbitrary precision
-            powered_matrix = self.matrix_power(self.transition_matrix, max_digits-1)
-            
-            # Apply to initial vector using manual multiplication for better precision
-            result_vector = np.zeros_like(initial_vector)
-            for i in range(matrix_size):
-                for j in range(matrix_size):
-                    if powered_matrix[i, j] != 0 and initial_vector[j] != 0:
-                        result_vector[i] = int(result_vector[i]) + int(powered_matrix[i, j]) * int(initial_vector[j])
+        # We need M^(max_digits-1) * v, which never needs the full power
+        result_vector = mat_pow_vec_mod(self.transition_matrix, max_digits-1, initial_vector, modulus)
         
         # Return the value from the accumulator state
         return int(result_vector[accumulator_idx])
@@ -1,41 +1,11 @@
 #!/usr/bin/env python3
 
-def matrix_multiply(A, B, mod):
-    """Multiply two matrices A and B modulo mod"""
-    n = len(A)
-    m = len(B[0])
-    k = len(B)
-    
-    result = [[0] * m for _ in range(n)]
-    for i in range(n):
-        for j in range(m):
-            for l in range(k):
-                result[i][j] = (result[i][j] + A[i][l] * B[l][j]) % mod
-    return result
-
-def matrix_power(matrix, power, mod):
-    """Compute matrix^power using binary exponentiation modulo mod"""
-    n = len(matrix)
-    
-    # Initialize result as identity matrix
-    result = [[0] * n for _ in range(n)]
-    for i in range(n):
-        result[i][i] = 1
-    
-    # Binary exponentiation
-    base = [row[:] for row in matrix]  # Copy matrix
-    
-    while power > 0:
-        if power & 1:
-            result = matrix_multiply(result, base, mod)
-        base = matrix_multiply(base, base, mod)
-        power >>= 1
-    
-    return result
+from pe_recurrence import linear_recurrence_nth
 
 def solve_recurrence_matrix(n):
     """
-    Solve the 23rd order recurrence using matrix exponentiation
+    Solve the 23rd order recurrence by polynomial exponentiation modulo its
+    characteristic polynomial (O(k^2 log n) rather than a 23x23 matrix power)
     """
     MOD = 10**8 + 7
     
@@ -79,33 +49,9 @@ def solve_recurrence_matrix(n):
     if n <= 23:
         return initial_values[n]
     
-    # Create transition matrix for the recurrence relation
-    # State vector: [a(k), a(k-1), a(k-2), ..., a(k-22)]
-    # Next state:   [a(k+1), a(k), a(k-1), ..., a(k-21)]
-    
-    transition_matrix = [[0] * 23 for _ in range(23)]
-    
-    # First row: coefficients of the recurrence relation
-    for i in range(23):
-        transition_matrix[0][i] = coefficients[i] % MOD
-    
-    # Other rows: shift previous values
-    for i in range(1, 23):
-        transition_matrix[i][i-1] = 1
-    
-    # Initial state vector: [a(23), a(22), a(21), ..., a(1)]
-    initial_state = [initial_values[23-i] for i in range(23)]
-    
-    # Compute transition_matrix^(n-23)
-    power = n - 23
-    result_matrix = matrix_power(transition_matrix, power, MOD)
-    
-    # Multiply result_matrix with initial_state to get final state
-    result = 0
-    for i in range(23):
-        result = (result + result_matrix[0][i] * initial_state[i]) % MOD
-    
-    return result
+    # The recurrence holds from a(24) on and only looks back to a(1), so
+    # index the sequence from a(1): a(n) is term n-1 of [a(1), ..., a(23), ...]
+    return linear_recurrence_nth(coefficients, initial_values[1:], n - 1, MOD)
 
 def solve_recurrence():
     """
@@ -1,15 +1,14 @@
 import math
 
+import numpy as np
+
 from sympy import primefactors,factorint
 
+from pe_sieve import primes_up_to
+from pe_polysieve import largest_prime_factors
+
 def sieve(limit):
-    is_prime = [True] * (limit + 1)
-    is_prime[0:2] = [False, False]
-    for i in range(2, int(limit ** 0.5) + 1):
-        if is_prime[i]:
-            for j in range(i*i, limit + 1, i):
-                is_prime[j] = False
-    return [i for i, val in enumerate(is_prime) if val]
+    return primes_up_to(limit).tolist()
 
 
 def factor(x):
@@ -32,12 +31,13 @@ def largest_prime_divisor(n):
 
     return n
 
-total = 1
-for i in range(2*1000000, 2*1000000 + 1):
-    if i%100000 == 0:
-        print("Done", i)
-    total += max(max(factorint(i+1)), max(factorint(i*i - i + 1))) - 1
-
-print(total)
+LIMIT = 2*1000000
 
+if __name__ == "__main__":
+    # f(k^3) = (largest prime factor of k^3 + 1) - 1, and k^3 + 1 = (k + 1)(k^2 - k + 1);
+    # both factors are sieved over k = 1..LIMIT, one prime progression at a time
+    linear = largest_prime_factors([1, 1], 1, LIMIT + 1)
+    quadratic = largest_prime_factors([1, -1, 1], 1, LIMIT + 1)
+    total = int((np.maximum(linear, quadratic) - 1).sum())
 
+    print(total)
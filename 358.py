@@ -1,61 +1,55 @@
-import math
-
-def modinv(a, m):
-    # Modular inverse using extended Euclidean algorithm
-    g, x, _ = extended_gcd(a, m)
-    if g != 1:
-        return None
-    return x % m
-
-def extended_gcd(a, b):
-    if a == 0:
-        return b, 0, 1
-    g, y, x = extended_gcd(b % a, a)
-    return g, x - (b // a) * y, y
-
-def starts_with(n, d, prefix):
-    # Use logarithmic method to extract leading digits
-    x = n * math.log10(10) - math.log10(d)
-    frac = x - int(x)
-    lead = int(10**(frac) * 1000)
-
-    return lead//10 == prefix
-
-def sieve_of_eratosthenes(limit):
-    # Create a boolean array "prime[0..limit]" and initialize all entries as True.
-    prime = [True] * (limit + 1)
-    prime[0] = prime[1] = False  # 0 and 1 are not primes
-
-    for p in range(2, int(limit**0.5) + 1):
-        if prime[p]:
-            # Marking multiples of p as False
-            for i in range(p * p, limit + 1, p):
-                prime[i] = False
-
-    # Return all prime numbers up to the limit
-    primes = [p for p in range(limit + 1) if prime[p]]
-    return primes
-
-
-def find_numbers(suffix=56789, prefix=137, limit=10**9):
+from pe_order import order_dividing
+from pe_sieve import iter_prime_blocks
+
+
+def prefix_interval(prefix):
+    """
+    (lo, hi) with 1/d = 0.<prefix>... exactly for lo <= d <= hi.
+
+    1/d starts with the digit string P of length L iff
+    P / 10^L <= 1/d < (P + 1) / 10^L, i.e. 10^L / (P + 1) < d <= 10^L / P.
+    The cyclic number of a full reptend prime d is the first d - 1 digits
+    of 1/d, so its prefix (leading zeros included) gives the same bound.
+    """
+    scale, P = 10 ** len(prefix), int(prefix)
+    return scale // (P + 1) + 1, scale // P
+
+
+def suffix_residue(suffix, width):
+    """
+    d mod 10^width for cyclic numbers (10^(d-1) - 1) / d ending in suffix.
+
+    Since 10^width | 10^(d-1), the cyclic number is -1/d modulo 10^width,
+    so d = -suffix^(-1) (mod 10^width).
+    """
+    mod_base = 10 ** width
+    return -pow(suffix, -1, mod_base) % mod_base
+
+
+def find_numbers(suffix=56789, prefix="00000000137"):
+    """
+    Full reptend primes d whose cyclic number starts with prefix and ends
+    with suffix.
+
+    The prefix confines d to a window of a few million and the suffix fixes
+    d modulo 10^5, which leaves a few dozen candidates.  Primes in the
+    window come from the segmented sieve one block at a time, and only the
+    candidates among them get the order check ord_d(10) = d - 1.
+    """
     suffix_len = len(str(suffix))
     mod_base = 10 ** suffix_len
-    primes = sieve_of_eratosthenes(limit)
-    for n in primes:
-        n -= 1
-        d = n + 1
-        # Check if (10^n - 1) % d == 0
-        if (pow(10, n, d) - 1) % d != 0:
-            continue
-        # Compute ((10^n - 1)/d) % mod_base using modular arithmetic
-        num_mod = (pow(10, n, d * mod_base) - 1) % (d * mod_base)
-        inv_d = modinv(d, mod_base)
-        if inv_d is None:
-            continue
-        result_mod = (num_mod * inv_d) % mod_base
-        if result_mod != suffix:
-            continue
-        if starts_with(n, d, prefix):
-            print(f"n = {n}, value ends with {suffix} and starts with {prefix}")
-
-find_numbers()
\ No newline at end of file
+    lo, hi = prefix_interval(prefix)
+    residue = suffix_residue(suffix, suffix_len)
+    found = []
+    for block in iter_prime_blocks(hi, start=lo):
+        for d in block[block % mod_base == residue].tolist():
+            if order_dividing(10, d, d - 1) == d - 1:
+                n = d - 1
+                print(f"n = {n}, value ends with {suffix} and starts with {prefix}")
+                found.append(d)
+    return found
+
+
+for d in find_numbers():
+    # Digits i and i + (d - 1) / 2 of a cyclic number sum to 9
+    print(f"d = {d}, digit sum = {9 * (d - 1) // 2}")
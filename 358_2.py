@@ -1,18 +1,18 @@
-from collections import deque
+from pe_digits import expansion_summary
 
-def last_k_digits_of_fraction(n, k=10):
-    d = n + 1
-    carry = 0
-    last_digits = []
 
-    for _ in range(n):
-        carry = carry * 10 + 9
-        digit = carry // d
-        last_digits.append(digit)
-        carry = carry % d
+def last_k_digits_of_fraction(n, k=10):
+    """
+    (digit sum, first k + 1 digits, last 5 digits) of the n-digit quotient
+    (10^n - 1) // (n + 1).
 
-    return last_digits
+    The numeral 99...9 is divided by d in blocks of digits (fill = 9), so
+    the digits are streamed instead of being collected in a list.
+    """
+    d = n + 1
+    total, head, tail = expansion_summary(0, d, n, keep=k + 1, fill=9)
+    return total, head, tail[-5:]
 
 n = 72509890
-q = last_k_digits_of_fraction(n)
-print("Last 10 digits:", sum(q), q[:11], q[-5:])
+total, head, tail = last_k_digits_of_fraction(n)
+print("Last 10 digits:", total, head, tail)
@@ -1,3 +1,5 @@
+from pe_blocksum import block_sum
+
 mod = int(1e9)
 def sum_k_squared_floor_n_div_k(n):
     """
@@ -9,30 +11,8 @@ def sum_k_squared_floor_n_div_k(n):
     Returns:
         The sum of K²⌊N/K⌋ for K from 1 to N
     """
-    total = 0
-    
-    # For each distinct value of ⌊N/K⌋
-    i = 1
-    while i <= n:
-        # d is the value of ⌊N/K⌋
-        d = n // i
-
-        steps += 1
-
-        # Find the upper bound for this value of d
-        j = n // d
-        
-        # Sum of squares formula: Σ(i² to j²) = (j(j+1)(2j+1) - i(i-1)(2i-1))/6
-        sum_squares = (j * (j + 1) * (2 * j + 1) - i * (i - 1) * (2 * i - 1)) // 6
-        
-        # Add the contribution of this range to the total
-        total += d * sum_squares
-        total %= mod
-        
-        # Move to the next distinct value of ⌊N/K⌋
-        i = j + 1
-    
-    return total
+    # Weight k^2 against f(v) = v over the O(sqrt(N)) blocks of constant ⌊N/K⌋
+    return block_sum(n, f=1, weight=2, mod=mod)
 
 
 def sum_k_squared_floor_n_div_k_brute_force(n):
@@ -1,79 +1,64 @@
-from math import gcd
-from sympy import totient, divisors
-from functools import cache
 import multiprocessing as mp
-from itertools import islice
 
-# Global cache with a Manager to share between processes
-manager = mp.Manager()
-order_cache = manager.dict()
+import numpy as np
+
+from pe_order import OrderTable
+
+_table = None
+
+
+def _init_worker(limit, spf_path):
+    """Build the order table unless it was inherited from the parent (fork)."""
+    global _table
+    if _table is None or _table.limit < limit:
+        _table = OrderTable(10, limit, spf_path)
+
 
-@cache
 def find_order_10_mod_k(K):
-    if gcd(10, K) != 1:
-        return None  # Order doesn't exist
-    phi_k = totient(K)
-    for d in sorted(divisors(phi_k)):
-        if pow(10, d, K) == 1:
-            return d
-    return None
-
-def process_number(n):
-    """Process a single number and return its order if it exists."""
-    # Check the shared cache first
-    if n in order_cache:
-        return order_cache[n]
-    
-    s = find_order_10_mod_k(n)
-    result = s if s is not None else 0
-    
-    # Update the shared cache
-    order_cache[n] = result
-    return result
-
-def generate_numbers_to_check(start, end):
-    """Generate numbers to check after removing factors of 2 and 5."""
-    numbers = []
-    for i in range(start, end):
-        n = i
-        while n % 2 == 0:
-            n //= 2
-        while n % 5 == 0:
-            n //= 5
-        if n > 0:
-            numbers.append(n)
-    return numbers
+    """ord_K(10), or None when gcd(10, K) != 1."""
+    if K % 2 == 0 or K % 5 == 0:
+        return None
+    _init_worker(K, None)
+    return int(_table.orders([K])[0])
+
+
+def multiplicity(m, limit):
+    """Number of n = m * 2^a * 5^b <= limit, for an int64 array m."""
+    count = np.zeros(m.size, dtype=np.int64)
+    powers_of_two = 1 << np.arange(63, dtype=np.int64)
+    quotient = limit // m
+    while quotient.any():
+        # a runs over 0..bit_length(quotient) - 1
+        count += np.searchsorted(powers_of_two, quotient, side="right")
+        quotient //= 5
+    return count
+
+
+def chunk_sum(bounds, limit):
+    """sum of L(n) over n <= limit whose 2,5-free part lies in [lo, hi)."""
+    lo, hi = bounds
+    m = np.arange(lo, hi, dtype=np.int64)
+    m = m[(m % 2 != 0) & (m % 5 != 0) & (m > 1)]
+    return int((_table.orders(m) * multiplicity(m, limit)).sum())
+
+
+def solve(limit, chunk_size=1_000_000, processes=None, spf_path=None):
+    """
+    sum of L(n), the recurring cycle length of 1/n, for 3 <= n <= limit.
+
+    L(n) = ord_m(10) for m = n with its 2s and 5s removed (0 when m = 1), so
+    every m coprime to 10 is handled once and weighted by the number of n
+    that reduce to it.  Chunks of m go to worker processes; each returns a
+    single int, so no state is shared between them.
+    """
+    _init_worker(limit, spf_path)
+    chunks = [(lo, min(lo + chunk_size, limit + 1)) for lo in range(1, limit + 1, chunk_size)]
+    work = [(bounds, limit) for bounds in chunks]
+    with mp.Pool(processes, initializer=_init_worker, initargs=(limit, spf_path)) as pool:
+        return sum(pool.starmap(chunk_sum, work))
+
 
 if __name__ == "__main__":
     limit = int(1e8)
-    batch_size = 1_000_000  # Process in large batches
-    
-    # Use all available cores except one
-    num_processes = max(1, mp.cpu_count() - 1)
-    
-    # Initialize the multiprocessing pool
-    pool = mp.Pool(processes=num_processes)
-    
-    total_count = 0
-    
-    # Process in batches to manage memory usage
-    for start in range(3, limit, batch_size):
-        end = min(start + batch_size, limit)
-        
-        # Get all numbers to check in this batch
-        numbers_to_check = generate_numbers_to_check(start, end)
-        
-        # Process numbers in parallel
-        results = pool.map(process_number, numbers_to_check, chunksize=1000)
-        
-        # Add batch results to total
-        batch_sum = sum(results)
-        total_count += batch_sum
-        
-        print(f"Processed {start} to {end-1}, current sum: {total_count}")
-    
-    # Clean up
-    pool.close()
-    pool.join()
-    
-    print(f"Final result: {total_count}")
\ No newline at end of file
+    assert solve(10**6) == 55535191115
+    print(f"Final result: {solve(limit)}")
@@ -1,25 +1,14 @@
 from collections import deque
 
+from pe_sieve import prime_mask
+
 def sieve_of_eratosthenes(n):
-    """Generate all primes up to n using the Sieve of Eratosthenes."""
+    """Generate all primes up to n using the shared segmented sieve."""
     if n < 2:
         return [], []
     
-    # Initialize boolean array with True values
-    is_prime = [True] * (n + 1)
-    is_prime[0] = is_prime[1] = False
-    
-    # Main sieve logic
-    p = 2
-    while p * p <= n:
-        if is_prime[p]:
-            # Mark all multiples of p as non-prime
-            for i in range(p * p, n + 1, p):
-                is_prime[i] = False
-        p += 1
-    
-    # Collect prime numbers
-    primes = [i for i in range(2, n + 1) if is_prime[i]]
+    is_prime = prime_mask(n)
+    primes = is_prime.nonzero()[0].tolist()
     return primes, is_prime
 
 def find_2s_relatives(n):
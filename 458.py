@@ -1,33 +1,4 @@
-def matrix_multiply(A, B, mod):
-    """Multiply two matrices A and B modulo mod"""
-    n = len(A)
-    m = len(B[0])
-    p = len(B)
-    
-    result = [[0] * m for _ in range(n)]
-    for i in range(n):
-        for j in range(m):
-            for k in range(p):
-                result[i][j] = (result[i][j] + A[i][k] * B[k][j]) % mod
-    return result
-
-def matrix_power(matrix, power, mod):
-    """Compute matrix^power modulo mod using fast exponentiation"""
-    n = len(matrix)
-    # Initialize result as identity matrix
-    result = [[0] * n for _ in range(n)]
-    for i in range(n):
-        result[i][i] = 1
-    
-    base = [row[:] for row in matrix]  # Copy matrix
-    
-    while power > 0:
-        if power % 2 == 1:
-            result = matrix_multiply(result, base, mod)
-        base = matrix_multiply(base, base, mod)
-        power //= 2
-    
-    return result
+from pe_matrix import mat_pow_vec_mod
 
 def print_matrix(matrix, title="Matrix"):
     """Helper function to print a matrix nicely"""
@@ -77,17 +48,11 @@ def count_simple_matrix(target_length, alphabet_size=7, mod=10**9):
     # Initial state vector for length 1: [7, 0, 0, 0, 0, 0]
     initial_state = [alphabet_size] + [0] * (n - 1)
     
-    # Compute transition^(target_length-1)
-    result_matrix = matrix_power(transition, target_length - 1, mod)
-    
-    # Apply to initial state
-    final_state = [0] * n
-    for i in range(n):
-        for j in range(n):
-            final_state[i] = (final_state[i] + result_matrix[i][j] * initial_state[j]) % mod
+    # Apply transition^(target_length-1) to the initial state
+    final_state = mat_pow_vec_mod(transition, target_length - 1, initial_state, mod)
     
     # Sum all states
-    return sum(final_state) % mod
+    return int(final_state.sum()) % mod
 
 def count_simple_original(target_length, alphabet_size=7):
     """Original DP solution for verification"""
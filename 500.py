@@ -1,14 +1,10 @@
 import heapq
 import math
 
+from pe_sieve import primes_up_to
+
 def sieve(n):
-    is_prime = [True] * (n+1)
-    is_prime[0] = is_prime[1] = False
-    for i in range(2, int(n**0.5)+1):
-        if is_prime[i]:
-            for j in range(i*i, n+1, i):    
-                is_prime[j] = False
-    return [i for i in range(n+1) if is_prime[i]]
+    return primes_up_to(n).tolist()
 
 def smallest_number_with_2n_divisors(n, mod=None):
     """
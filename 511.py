@@ -1,7 +1,8 @@
 n = 1234567898765
 k = 4321
 import numpy as np
-import cupy as cp
+
+from pe_matrix import mat_pow_vec_mod
 
 #n = 4
 #k = 3
@@ -28,57 +29,13 @@ for i in range(k):
         matrix[new_mod][i] = 1
 
 
-initial_matrix = cp.zeros((k, 1), dtype=cp.int64)
-initial_matrix[n%k,:] = 1
+initial_vector = np.zeros(k, dtype=np.int64)
+initial_vector[n%k] = 1
 
 
 MOD = 10**9 + 7  # Standard modulus for Project Euler problems
-C = matrix
-
-def matrix_power(M, exponent, mod):
-    if exponent == 0:
-        return np.identity(M.shape[0], dtype=np.int64) % mod
-    if exponent == 1:
-        return M % mod
-
-    half = matrix_power(M, exponent // 2, mod)
-    result = np.matmul(half, half) % mod
-
-    if exponent % 2 == 0:
-        return result
-    else:
-        return np.matmul(M, result) % mod
-
-
-def modular_matmul(A, B, mod):
-    """Perform matrix multiplication with modular arithmetic"""
-    # Simple approach: since we're applying mod at each step of exponentiation,
-    # the values shouldn't grow too large
-    result = cp.matmul(A, B) % mod
-    return result
-
-def matrix_power_gpu(M, exponent, mod):
-    if exponent == 0:
-        return cp.identity(M.shape[0], dtype=cp.int64) % mod
-    if exponent == 1:
-        return M % mod
-
-    half = matrix_power_gpu(M, exponent // 2, mod) % mod
-    # Use modular matrix multiplication to prevent overflow
-    result = modular_matmul(half, half, mod)
-
-    if exponent % 2 == 0:
-        return result
-    else:
-        # Apply modular arithmetic to prevent overflow
-        return modular_matmul(M % mod, result, mod)
-
-C = cp.array(C, dtype=cp.int64)
-matrix = matrix_power_gpu(C, n, MOD)
-
 
-print(initial_matrix)
-result = modular_matmul(matrix, initial_matrix, MOD)
+result = mat_pow_vec_mod(matrix, n, initial_vector, MOD)
 
 print(result)
 
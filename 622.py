@@ -1,22 +1,15 @@
-from sympy import divisors, gcd
-from math import gcd
+from sympy import divisors
 
-N = 60
-def order_mod(a, n):
-    if gcd(a, n) != 1:
-        return 0
-    for k in sorted(divisors(N)):
-        if pow(a, k, n) == 1:
-            return k
-    return 0
+from pe_order import order_dividing
 
+N = 60
 MOD_EXP = N
 target = 2**MOD_EXP - 1
 
+# Every odd divisor d of 2^N - 1 has ord_d(2) | N; keep those where it is exactly N
 valid_m = []
 for d in divisors(target):
-    if d % 2 == 1 and gcd(2, d) == 1:
-        if order_mod(2, d) == MOD_EXP:
-            valid_m.append((d - 1) // 2)
+    if d % 2 == 1 and order_dividing(2, d, MOD_EXP) == MOD_EXP:
+        valid_m.append((d - 1) // 2)
 
 print(sum([2*n+2 for n in valid_m]))
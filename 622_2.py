@@ -1,16 +1,16 @@
+from pe_order import multiplicative_order, order_table
+
+LIMIT = 100
+# ord_m(2) for every odd modulus m = 2n - 1 with n < LIMIT
+orders = order_table(2, 2 * LIMIT)
+
+
 def find_order(base, modulus):
     """Find multiplicative order of base modulo modulus"""
-    if modulus == 1:
-        return 1
-    
-    m = 1
-    power = base % modulus
-    
-    while power != 1:
-        power = (power * base) % modulus
-        m += 1
-    
-    return m
+    if base == 2 and modulus < len(orders):
+        return int(orders[modulus])
+    return multiplicative_order(base, modulus)
+
 
 n = 52
 modulus = 2*n - 1  # 103
@@ -19,7 +19,7 @@ print(f"For n={n}, modulus={modulus}, s(n) = {result}")
 
 # Let's also find all n where s(n) = 8
 results = []
-for n in range(2, 100):
+for n in range(2, LIMIT):
     modulus = 2*n - 1
     if find_order(2, modulus) == 8:
         results.append(n)
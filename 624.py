@@ -1,3 +1,5 @@
+from pe_matrix import mat_pow_mod
+
 # Helper function for modular exponentiation
 def power(base, exp, mod):
     res = 1
@@ -13,25 +15,9 @@ def power(base, exp, mod):
 def modInverse(n, mod):
     return power(n, mod - 2, mod)
 
-# Helper function for 2x2 matrix multiplication modulo mod
-def matrix_mult(A, B, mod):
-    C = [[0, 0], [0, 0]]
-    C[0][0] = (A[0][0] * B[0][0] + A[0][1] * B[1][0]) % mod
-    C[0][1] = (A[0][0] * B[0][1] + A[0][1] * B[1][1]) % mod
-    C[1][0] = (A[1][0] * B[0][0] + A[1][1] * B[1][0]) % mod
-    C[1][1] = (A[1][0] * B[0][1] + A[1][1] * B[1][1]) % mod
-    return C
-
 # Helper function for 2x2 matrix exponentiation modulo mod
 def matrix_pow(matrix, exp, mod):
-    res_matrix = [[1, 0], [0, 1]] # Identity matrix
-    base_matrix = matrix
-    while exp > 0:
-        if exp % 2 == 1:
-            res_matrix = matrix_mult(res_matrix, base_matrix, mod)
-        base_matrix = matrix_mult(base_matrix, base_matrix, mod)
-        exp //= 2
-    return res_matrix
+    return mat_pow_mod(matrix, exp, mod).tolist()
 
 def solve():
     N_val = 10**18
@@ -1,5 +1,6 @@
 from collections import defaultdict
 import math
+import numpy as np
 import time
 import matplotlib.pyplot as plt
 from bisect import insort_left, bisect_left
@@ -212,6 +213,74 @@ def solve(n):
     print(f"S(L{n}) = {S}")
     return M, S
 
+# Packed line key: direction (a, b) with a in [0, 2000], b in [-2000, 2000],
+# then c = -(a*x + b*y) with |c| <= 4 * 10^6
+B_SPAN = 4001
+C_OFFSET = 4 * 10**6
+C_SPAN = 2 * C_OFFSET + 1
+
+def _pair_line_keys(xs, ys, lo, hi, parts=1, part=0):
+    """
+    Packed keys of the lines through points i and j for lo <= i < hi, i < j,
+    restricted to directions in the given hash partition.
+    """
+    n = len(xs)
+    I = np.arange(lo, hi)[:, None]
+    J = np.arange(n)[None, :]
+    upper = J > I
+    I, J = np.broadcast_to(I, upper.shape)[upper], np.broadcast_to(J, upper.shape)[upper]
+    
+    a = ys[J] - ys[I]
+    b = xs[I] - xs[J]
+    g = np.gcd(a, b)
+    valid = g > 0  # coincident points do not define a line
+    a, b, g, I = a[valid], b[valid], g[valid], I[valid]
+    
+    # Primitive direction with a > 0, or a == 0 and b > 0
+    sign = np.where((a < 0) | ((a == 0) & (b < 0)), -1, 1)
+    a = a // g * sign
+    b = b // g * sign
+    c = -(a * xs[I] + b * ys[I])
+    
+    direction = a * B_SPAN + (b + B_SPAN // 2)
+    if parts > 1:
+        keep = direction % parts == part
+        direction, c = direction[keep], c[keep]
+    return direction * C_SPAN + (c + C_OFFSET)
+
+def solve_vectorized(n, block_pairs=1 << 22, max_keys=1 << 24):
+    """
+    M and S from vectorized pair enumeration.
+
+    Lines are packed into int64 keys and deduplicated with np.unique; S is
+    M^2 minus the sum of squared slope-group sizes.  When there are more than
+    max_keys pairs the directions are hash-partitioned and each partition is
+    enumerated in its own pass, so memory stays bounded for large n.
+    """
+    start_time = time.time()
+    points = np.array(generate_points(n), dtype=np.int64)
+    xs, ys = points[:, 0], points[:, 1]
+    
+    total_pairs = n * (n - 1) // 2
+    parts = max(1, -(-total_pairs // max_keys))
+    rows_per_block = max(1, block_pairs // max(n, 1))
+    
+    M = 0
+    sum_squares = 0
+    for part in range(parts):
+        blocks = [_pair_line_keys(xs, ys, lo, min(lo + rows_per_block, n), parts, part)
+                  for lo in range(0, n, rows_per_block)]
+        keys = np.unique(np.concatenate(blocks)) if blocks else np.zeros(0, dtype=np.int64)
+        _, group_sizes = np.unique(keys // C_SPAN, return_counts=True)
+        M += int(group_sizes.sum())
+        sum_squares += int((group_sizes.astype(np.int64) ** 2).sum())
+    
+    S = M * M - sum_squares
+    elapsed = time.time() - start_time
+    print(f"Vectorized calculation completed in {elapsed:.2f} seconds ({parts} pass(es))")
+    print(f"M(L{n}) = {M}, S(L{n}) = {S}")
+    return M, S
+
 def visualize_points(n):
     """
     Create a scatter plot visualization of the first n points.
@@ -322,7 +391,13 @@ if M100 != 4948 or S100 != 24477690:
 else:
     print("Sweep-line test case passed!")
 
-# Visualize L100 points
-M2500, L2500 = solve_sweep_line(2500)
+print("\nTesting vectorized algorithm with n=100:")
+M100, S100 = solve_vectorized(100)
+if M100 != 4948 or S100 != 24477690:
+    print("ERROR: Vectorized algorithm test case failed!")
+else:
+    print("Vectorized test case passed!")
+
+M2500, L2500 = solve_vectorized(2500)
 
 print(M2500, L2500)
\ No newline at end of file
@@ -14,21 +14,15 @@ S(5) = 5736
 S(100) mod 10^9 + 7 = 332792866
 """
 
-from functools import cache
+import numpy as np
 
-@cache
-def prime_factorization(n):
+from pe_spf import factor_many, factorize, spf_table
+
+MOD = 10**9 + 7
+
+def prime_factorization(n, spf=None):
     """Return the prime factorization of n as a dictionary {prime: exponent}."""
-    factors = {}
-    d = 2
-    while d * d <= n:
-        while n % d == 0:
-            factors[d] = factors.get(d, 0) + 1
-            n //= d
-        d += 1
-    if n > 1:
-        factors[n] = factors.get(n, 0) + 1
-    return factors
+    return factorize(n, spf if spf is not None else spf_table(n))
 
 def mod_pow(base, exponent, modulus):
     """Calculate (base^exponent) % modulus efficiently."""
@@ -68,9 +62,9 @@ def sum_of_geometric_series(a, r, n, mod):
     denominator = (r - 1) % mod
     return (a * numerator * mod_inverse(denominator, mod)) % mod
 
-def S(n):
+def S(n, spf=None):
     """Calculate S(n) modulo 10^9 + 7."""
-    MOD = 10**9 + 7
+    spf = spf if spf is not None else spf_table(n)
     
     # Store the prime factorization of the product
     prime_exponents = {}
@@ -85,7 +79,7 @@ def S(n):
             continue
         
         # Get prime factorization of k
-        factors = prime_factorization(k)
+        factors = factorize(k, spf)
         
         # Update the exponents in our overall factorization
         for prime, count in factors.items():
@@ -109,15 +103,64 @@ def S(n):
     
     return result
 
+def pow_mod_many(base, exponent, modulus):
+    """Elementwise base^exponent % modulus for int64 arrays (modulus < 2^31)."""
+    result = np.ones(base.shape, dtype=np.int64)
+    base = base % modulus
+    exponent = exponent.copy()
+    while exponent.any():
+        odd = (exponent & 1) == 1
+        result[odd] = result[odd] * base[odd] % modulus
+        exponent >>= 1
+        base = base * base % modulus
+    return result
+
+def product_mod(values, modulus):
+    """Product of an int64 array modulo modulus by pairwise halving."""
+    values = values % modulus
+    while len(values) > 1:
+        if len(values) % 2:
+            values = np.append(values, 1)
+        values = values[0::2] * values[1::2] % modulus
+    return int(values[0]) if len(values) else 1
+
+def S_all(limit):
+    """
+    Yield S(1), ..., S(limit), factorising 1..limit once.
+
+    The exponent of p in prod_k k^(2k - n - 1) is 2*A_p(n) - (n + 1)*B_p(n)
+    with A_p(n) = sum_{k<=n} k*v_p(k) and B_p(n) = sum_{k<=n} v_p(k), so both
+    sums are updated with the factors of n and every S(n) is one vectorised
+    product of geometric series over the primes up to n.
+    """
+    spf = spf_table(limit)
+    index, primes, exponents = factor_many(np.arange(1, limit + 1), spf)
+    prime_list = np.unique(primes)
+    slot = np.searchsorted(prime_list, primes)
+    bounds = np.searchsorted(index, np.arange(limit + 1))
+    inverse = np.array([pow(int(p) - 1, -1, MOD) for p in prime_list], dtype=np.int64)
+    
+    A = np.zeros(len(prime_list), dtype=np.int64)
+    B = np.zeros(len(prime_list), dtype=np.int64)
+    for n in range(1, limit + 1):
+        lo, hi = bounds[n - 1], bounds[n]
+        A[slot[lo:hi]] += n * exponents[lo:hi]
+        B[slot[lo:hi]] += exponents[lo:hi]
+        m = np.searchsorted(prime_list, n, side="right")
+        exponent = 2 * A[:m] - (n + 1) * B[:m]
+        # 1 + p + ... + p^e = (p^(e+1) - 1) / (p - 1)
+        terms = (pow_mod_many(prime_list[:m], exponent + 1, MOD) - 1) % MOD * inverse[:m] % MOD
+        yield product_mod(terms, MOD)
+
 # Test cases
 
 ans = 0
 
-for i in range(1, 20001):
+for i, value in enumerate(S_all(20000), 1):
     if i%1000 == 0:
         print(i)
-    ans += S(i)
-    ans %= int(1e9 + 7)
+    ans += value
+    ans %= MOD
 
 print(ans)
 
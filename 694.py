@@ -1,13 +1,9 @@
 from math import isqrt
 
+from pe_sieve import primes_up_to
+
 def generate_primes(limit):
-    sieve = [True] * (limit + 1)
-    sieve[0] = sieve[1] = False
-    for i in range(2, isqrt(limit) + 1):
-        if sieve[i]:
-            for j in range(i * i, limit + 1, i):
-                sieve[j] = False
-    return [i for i, is_p in enumerate(sieve) if is_p]
+    return primes_up_to(limit).tolist()
 
 def compute_S(n):
     primes = generate_primes(int(n ** (1/3)) + 10)
@@ -1,11 +1,9 @@
 from math import log
+
+from pe_sieve import primes_up_to
+
 def primes(N):
-    sieve = [True] * (N+1)
-    sieve[0] = sieve[1] = False
-    for i in range(2, int(N**0.5)+1):
-        if sieve[i]:
-            sieve[i*i:N+1:i] = [False] * len(range(i*i, N+1, i))
-    return [i for i in range(N+1) if sieve[i]]
+    return primes_up_to(N).tolist()
 
 
 def main(): 
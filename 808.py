@@ -1,14 +1,8 @@
+from pe_sieve import iter_primes
+
 def sieve_of_eratosthenes(limit):
-    """Generate all primes up to limit using Sieve of Eratosthenes."""
-    sieve = [True] * (limit + 1)
-    sieve[0] = sieve[1] = False
-    
-    for i in range(2, int(limit**0.5) + 1):
-        if sieve[i]:
-            for j in range(i*i, limit + 1, i):
-                sieve[j] = False
-                
-    return [i for i in range(limit + 1) if sieve[i]]
+    """Generate all primes up to limit using the shared segmented sieve."""
+    return iter_primes(limit)
 
 def reverse_number(n):
     """Reverse the digits of a number."""
@@ -23,18 +17,17 @@ def find_reversible_prime_squares(count):
     
     # Generate primes using sieve (we'll use a high enough limit)
     limit = 100000000  # This should be enough for our purposes
-    primes = sieve_of_eratosthenes(limit)
     
     # Generate all prime squares and store in a hash set for O(1) lookup
     prime_squares = {}  # Maps square value to the prime that generated it
-    for p in primes:
+    for p in sieve_of_eratosthenes(limit):
         prime_squares[p*p] = p
     
     reversible_squares = []
     seen = set()  # To avoid duplicates
     
     # Now check each prime square
-    for p in primes:
+    for p in prime_squares.values():
         square = p * p
         
         if square in seen:
@@ -1,3 +1,27 @@
+import numpy as np
+
+from pe_order import period_table, pow_mod_many
+
+
+def nth_digit(x, n):
+    """
+    The nth digit after the point of 1/x, read off directly.
+    
+    The digit is floor(10 * r / x) with r = 10^(n-1) mod x, the remainder
+    the long division would reach after n - 1 steps.  Terminating expansions
+    need no special case: once x | 10^(n-1) the remainder and digit are 0.
+    """
+    if n <= 0:
+        return 0
+    return 10 * pow(10, n - 1, x) // x
+
+
+def nth_digits(n, N):
+    """int64 array of the nth digit of 1/x for x = 1..N, via vectorised pow."""
+    x = np.arange(1, N + 1, dtype=np.int64)
+    return 10 * pow_mod_many(10, n - 1, x) // x
+
+
 def find_nth_digit(x, n):
     """
     Find the nth digit in the fractional part of 1/x.
@@ -10,51 +34,11 @@ def find_nth_digit(x, n):
     Returns:
         The nth digit in the fractional part, or 0 if it doesn't exist
     """
-    if n <= 0:
-        return 0
-    
-    # Handle the special case where x is 1
-    if x == 1:
-        return 0
-    
-    # Dictionary to store the position where each remainder first appears
-    remainders = {}
-    
-    # Initialize variables
-    remainder = 1  # Start with numerator 1
-    position = 0
-    
-    # Store digits of the decimal expansion
-    digits = []
-    
-    # Perform long division
-    while remainder != 0 and remainder not in remainders:
-        remainders[remainder] = position
-        remainder *= 10
-        digits.append(remainder // x)
-        remainder %= x
-        position += 1
-    
-    # If remainder is 0, the decimal expansion terminates
-    if remainder == 0:
-        if n <= len(digits):
-            return digits[n-1]
-        else:
-            return 0
-    
-    # Find the start of the repeating part
-    start_repeat = remainders[remainder]
-    
-    # Calculate the period length
-    period_length = position - start_repeat
-    
-    # Handle non-repeating part
-    if n <= start_repeat:
-        return digits[n-1]
-    
-    # Handle repeating part
-    adjusted_n = (n - start_repeat - 1) % period_length + start_repeat
-    return digits[adjusted_n]
+    return nth_digit(x, n)
+
+
+_periods = np.zeros(1, dtype=np.int64)
+
 
 def get_period_length(x):
     """
@@ -66,40 +50,16 @@ def get_period_length(x):
     Returns:
         The length of the period, or 0 if the decimal terminates
     """
-    if x == 1:
-        return 0
-    
-    # Dictionary to store the position where each remainder first appears
-    remainders = {}
-    
-    # Initialize variables
-    remainder = 1
-    position = 0
-    
-    # Perform long division until we find a repeating remainder or termination
-    while remainder != 0 and remainder not in remainders:
-        remainders[remainder] = position
-        remainder = (remainder * 10) % x
-        position += 1
-    
-    # If remainder is 0, the decimal expansion terminates
-    if remainder == 0:
-        return 0
-    
-    # The period length is the current position minus the position 
-    # where the remainder was first seen
-    return position - remainders[remainder]
+    global _periods
+    if x >= len(_periods):
+        # Grow the shared table geometrically so repeated calls stay cheap
+        _periods = period_table(10, max(x, 2 * len(_periods)))
+    return int(_periods[x])
 
 # Example usage
 if __name__ == "__main__":
     # Test case: 1/7 = 0.142857142857... (period 6)
+    assert find_nth_digit(7, 1) == 1 and find_nth_digit(7, 6) == 7
+    assert nth_digits(7, 7).sum() == 10 and nth_digits(100, 100).sum() == 418
 
-    count = 0
-    for i in range(1, 10**7):
-        print("Doing ", i)
-        if i%100000 == 0:
-            print("Done ", i)
-        count += find_nth_digit(i, 10**7)
-
-    print(count)
-
+    print(int(nth_digits(10**7, 10**7).sum()))
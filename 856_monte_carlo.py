@@ -3,17 +3,20 @@
 import random
 import numpy as np
 
-def simulate_one_trial():
+from pe_montecarlo import run_until
+
+def simulate_one_trial(rng=random):
     """
     Simulate drawing cards from a shuffled deck until finding
     a consecutive pair of the same rank or reaching the end.
+    rng is anything with a shuffle method (the random module or a numpy Generator).
     Returns the number of cards drawn.
     """
     # Create a standard deck (values represent ranks 0-12)
     deck = [rank % 13 for rank in range(52)]
     
     # Shuffle the deck
-    random.shuffle(deck)
+    rng.shuffle(deck)
     
     # Draw cards until finding consecutive pair or end of deck
     draws = 1  # First card is always drawn
@@ -49,6 +52,33 @@ def monte_carlo_simulation(num_trials=1000000):
     expected_draws = total_draws / num_trials
     return expected_draws
 
+DECK = np.arange(52, dtype=np.int8) % 13
+
+def simulate_trials_batched(rng, n):
+    """
+    Vectorized simulate_one_trial: shuffle n decks at once (one row each,
+    as the argsort of a uniform matrix) and find the first equal adjacent
+    pair per row.  Returns the number of cards drawn for every trial (52 if
+    no pair).
+    """
+    # float64 keys: ties, which would bias the permutation, are ~1e-13 per deck
+    decks = DECK[rng.random((n, 52)).argsort(axis=1)]
+    pairs = decks[:, 1:] == decks[:, :-1]
+    # Pair at (i, i+1) means i + 2 cards were drawn
+    return np.where(pairs.any(axis=1), pairs.argmax(axis=1) + 2, 52)
+
+def sample_trials(rng, n):
+    """pe_montecarlo sampler: n independent trials drawn from rng"""
+    return simulate_trials_batched(rng, n)
+
+def monte_carlo_parallel(target_half_width=1e-3, seed=42):
+    """
+    Run trials on every core until the 95% confidence half-width
+    drops below target_half_width.
+    """
+    stats = run_until(sample_trials, target_half_width, seed=seed, batch_size=1 << 14)
+    return stats.mean, stats.half_width(), stats.count
+
 if __name__ == "__main__":
     # Set seed for reproducibility
     random.seed(42)
@@ -63,6 +93,10 @@ if __name__ == "__main__":
     expected = monte_carlo_simulation(trials)
     print(f"Expected number of draws: {expected:.8f}")
     
+    print("Running parallel simulation until the 95% half-width is below 2e-3...")
+    parallel_mean, parallel_half_width, parallel_trials = monte_carlo_parallel(2e-3)
+    print(f"Parallel estimate: {parallel_mean:.8f} ± {parallel_half_width:.8f} ({parallel_trials:,} trials)")
+    
     # Calculate a modified expectation where we add 52 when no pair is found
     # This seems to be what the user is suggesting
     modified_total = 0
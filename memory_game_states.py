@@ -0,0 +1,65 @@
+"""
+Symmetry reduction for the Larry/Robin memory-game solvers.
+
+Two states that differ only by a relabelling of the symbols have identical
+futures, so every state is rewritten with its symbols renumbered in order of
+first appearance (Larry's memory first, then Robin's) and interned into a
+dense id.  Successors are computed once per id and cached, so probability
+mass from equivalent states is merged before it is accumulated.
+"""
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+
+def canonical_pair(larry_memory: tuple, robin_memory: tuple) -> Tuple[tuple, tuple]:
+    """Relabel symbols 0, 1, 2, ... in order of first appearance."""
+    labels = {}
+    for symbol in larry_memory + robin_memory:
+        if symbol not in labels:
+            labels[symbol] = len(labels)
+    return (tuple(labels[x] for x in larry_memory),
+            tuple(labels[x] for x in robin_memory))
+
+
+class StateTable:
+    """
+    Dense ids for canonical states plus a successor cache.
+
+    canonicalise maps any state to its canonical representative; expand maps
+    a canonical state to (next_state, weight) pairs, which need not be
+    canonical themselves.
+    """
+
+    def __init__(self, canonicalise: Callable[[Hashable], Hashable],
+                 expand: Callable[[Hashable], Iterable[Tuple[Hashable, float]]]):
+        self.canonicalise = canonicalise
+        self.expand = expand
+        self.states: List[Hashable] = []
+        self.ids: Dict[Hashable, int] = {}
+        self._successors: Dict[int, List[Tuple[int, float]]] = {}
+
+    def __len__(self):
+        return len(self.states)
+
+    def __getitem__(self, state_id: int):
+        return self.states[state_id]
+
+    def intern(self, state) -> int:
+        key = self.canonicalise(state)
+        state_id = self.ids.get(key)
+        if state_id is None:
+            state_id = len(self.states)
+            self.ids[key] = state_id
+            self.states.append(key)
+        return state_id
+
+    def successors(self, state_id: int) -> List[Tuple[int, float]]:
+        """(next_id, weight) pairs, with weights of equivalent successors summed."""
+        cached = self._successors.get(state_id)
+        if cached is None:
+            merged: Dict[int, float] = {}
+            for next_state, weight in self.expand(self.states[state_id]):
+                next_id = self.intern(next_state)
+                merged[next_id] = merged.get(next_id, 0.0) + weight
+            cached = list(merged.items())
+            self._successors[state_id] = cached
+        return cached
@@ -2,8 +2,11 @@ import random
 import numpy as np
 import time
 from collections import deque
+from functools import partial
 from tqdm import tqdm
 
+from pe_montecarlo import RunningStats, run_until
+
 def in_memory(memory, number):
     """Check if a number is in memory"""
     return number in memory
@@ -30,8 +33,9 @@ def update_robin_memory(memory, number):
         memory_list.pop()
     return tuple(memory_list)
 
-def simulate_game(rounds=50):
-    """Simulate one game of Larry and Robin's memory game"""
+def simulate_game(rounds=50, rng=None):
+    """Simulate one game of Larry and Robin's memory game.
+    Draws from the numpy Generator rng when given, else the random module."""
     # Initialize memories with zeros (or other starting values)
     larry_memory = tuple([0, 0, 0, 0, 0])  # Can be changed to any initial state
     robin_memory = tuple([0, 0, 0, 0, 0])
@@ -44,7 +48,7 @@ def simulate_game(rounds=50):
     
     for _ in range(rounds):
         # Pick a random number from 1 to 10
-        number = random.randint(1, 10)
+        number = random.randint(1, 10) if rng is None else int(rng.integers(1, 11))
         
         # Check who remembers the number
         larry_remembers = in_memory(larry_memory, number)
@@ -66,6 +70,91 @@ def simulate_game(rounds=50):
     
     return abs(larry_score - robin_score)
 
+def simulate_games_batched(batch_size, rounds=50, rng=None, memory_size=5):
+    """
+    Play batch_size independent games at once, returning |larry - robin| per game.
+
+    Memories are int8 arrays with one row per memory slot and one column per
+    game, starting all-zero as in simulate_game; each round draws every game's
+    number with one call and updates the slots with whole-row operations.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    larry_memory = np.zeros((memory_size, batch_size), dtype=np.int8)
+    robin_memory = np.zeros((memory_size, batch_size), dtype=np.int8)
+    score = np.zeros(batch_size, dtype=np.int16)  # larry_score - robin_score
+    
+    for _ in range(rounds):
+        number = rng.integers(1, 11, size=batch_size, dtype=np.int8)
+        
+        larry_hit = larry_memory == number
+        robin_hit = robin_memory == number
+        larry_remembers = larry_hit.any(axis=0)
+        robin_remembers = robin_hit.any(axis=0)
+        
+        score += larry_remembers
+        score -= robin_remembers
+        
+        # Larry: move to front; slots up to the old position (or all of them
+        # when it was missing) shift back by one, the rest stay put
+        keep = ~np.logical_or.accumulate(larry_hit, axis=0)
+        for slot in range(memory_size - 1, 0, -1):
+            np.copyto(larry_memory[slot], larry_memory[slot - 1], where=keep[slot - 1])
+        larry_memory[0] = number
+        
+        # Robin: push to front only when the number is new
+        new = ~robin_remembers
+        for slot in range(memory_size - 1, 0, -1):
+            np.copyto(robin_memory[slot], robin_memory[slot - 1], where=new)
+        np.copyto(robin_memory[0], number, where=new)
+    
+    return np.abs(score)
+
+def sample_scores(rng, n, rounds=50):
+    """pe_montecarlo sampler: n batched games on the given generator"""
+    return simulate_games_batched(n, rounds, rng)
+
+def monte_carlo_batched(num_simulations=10000000, rounds=50, batch_size=1 << 18, seed=None):
+    """Batched version of monte_carlo_simulation that never stores the scores"""
+    start_time = time.time()
+    
+    rng = np.random.default_rng(seed)
+    stats = RunningStats()
+    remaining = num_simulations
+    with tqdm(total=num_simulations) as progress:
+        while remaining > 0:
+            batch = min(batch_size, remaining)
+            stats.add_batch(simulate_games_batched(batch, rounds, rng))
+            remaining -= batch
+            progress.update(batch)
+    
+    expected_value = stats.mean
+    std_dev = np.sqrt(stats.variance)
+    
+    end_time = time.time()
+    
+    print(f"Batched Monte Carlo simulation with {num_simulations} runs:")
+    print(f"- Expected value: {expected_value:.6f}")
+    print(f"- Standard deviation: {std_dev:.6f}")
+    print(f"- 95% confidence interval: {expected_value:.6f} ± {1.96 * std_dev / np.sqrt(num_simulations):.6f}")
+    print(f"- Time taken: {end_time - start_time:.2f} seconds")
+    
+    return expected_value
+
+def monte_carlo_parallel(target_half_width=1e-3, rounds=50, seed=None, processes=None):
+    """Batched games on every core until the 95% CI half-width reaches the target"""
+    start_time = time.time()
+    
+    stats = run_until(partial(sample_scores, rounds=rounds), target_half_width,
+                      seed=seed, processes=processes)
+    
+    print(f"Parallel Monte Carlo simulation with {stats.count} runs:")
+    print(f"- Expected value: {stats.mean:.6f}")
+    print(f"- Standard deviation: {np.sqrt(stats.variance):.6f}")
+    print(f"- 95% confidence interval: {stats.mean:.6f} ± {stats.half_width():.6f}")
+    print(f"- Time taken: {time.time() - start_time:.2f} seconds")
+    
+    return stats.mean
+
 def monte_carlo_simulation(num_simulations=1000000, rounds=50):
     """Run multiple simulations and calculate expected value"""
     start_time = time.time()
@@ -91,14 +180,18 @@ if __name__ == "__main__":
     import sys
     
     # Default parameters
-    num_simulations = 1000000
+    num_simulations = 10000000
     rounds = 50
     
     # Parse command line arguments if provided
+    # A third argument switches to the parallel run with that CI half-width
     if len(sys.argv) > 1:
         rounds = int(sys.argv[1])
     if len(sys.argv) > 2:
         num_simulations = int(sys.argv[2])
     
     # Run simulation
-    monte_carlo_simulation(num_simulations, rounds) 
+    if len(sys.argv) > 3:
+        monte_carlo_parallel(float(sys.argv[3]), rounds)
+    else:
+        monte_carlo_batched(num_simulations, rounds) 
@@ -0,0 +1,325 @@
+"""
+Sums over the blocks of constant floor(N/k), shared by the Python solutions.
+
+    block_sum(N, f, weight, mod) = sum_{k=1}^{N} w(k) * f(floor(N/k))
+
+floor(N/k) takes O(sqrt N) distinct values, and on each block [start, end]
+of k with the same value v the weights collapse to W(end) - W(start - 1),
+where W is the prefix sum of w.  Blocks are generated as NumPy arrays in
+chunks, so memory stays bounded for any N < 2^63.
+
+Both w and f are given either as an exponent p (meaning x^p), as a sequence
+of power-basis coefficients (Fractions allowed, as long as the polynomial
+is integer-valued, e.g. v(v+1)/2), or as a callable.  For w a callable is
+the prefix sum W itself; for f it is f.  Polynomials are rewritten in the
+binomial basis sum_i b_i C(x, i), where the prefix sum is again a
+polynomial that int64 can evaluate exactly without dividing (see _Poly):
+
+* with mod < 2^31 everything is reduced and multiplied in int64;
+* with mod=None a float64 shadow of each chunk decides whether int64 is
+  exact, otherwise that chunk (and any callable) is evaluated as object.
+
+block_sum_many evaluates the same sum for many N in one pass.
+"""
+from fractions import Fraction
+from functools import cache
+from math import comb, factorial, isqrt
+
+import numpy as np
+
+from pe_sieve import primes_up_to
+
+DEFAULT_CHUNK = 1 << 20
+
+_INT64_MOD_LIMIT = 1 << 31
+_SAFE = float(1 << 62)
+_TABLE_LIMIT = 1 << 16  # largest d! for the table evaluation
+_INT64_MAX = (1 << 63) - 1
+_WRAP = 1 << 64
+
+
+def _edge_chunks(N, chunk):
+    """
+    Yield (edges, value): consecutive blocks (edges[j], edges[j+1]] of k with
+    floor(N/k) == value[j], covering k = 1..N in order.  Values never hit
+    give empty blocks (equal edges), which contribute nothing to a sum.
+    """
+    if N < 1:
+        return
+    s = isqrt(N)
+    # k < s: k(k+1) < N, so consecutive quotients differ and blocks are single k
+    for lo in range(1, s, chunk):
+        k = np.arange(lo, min(lo + chunk, s), dtype=np.int64)
+        yield np.concatenate(([lo - 1], k)), N // k
+    # k >= s: one block per value v = N//s, ..., 1
+    top = N // s
+    for hi in range(top, 0, -chunk):
+        v = np.arange(hi, max(hi - chunk, 0), -1, dtype=np.int64)
+        yield np.concatenate(([N // (hi + 1)], N // v)), v
+
+
+def floor_blocks(N, chunk=DEFAULT_CHUNK):
+    """
+    Yield (start, end, value) int64 arrays covering k = 1..N in increasing
+    order, with floor(N/k) == value for start <= k <= end.
+    """
+    for edges, value in _edge_chunks(N, chunk):
+        hit = edges[1:] > edges[:-1]
+        yield edges[:-1][hit] + 1, edges[1:][hit], value[hit]
+
+
+def _stirling2(n):
+    """Rows S2(p, i) for p <= n."""
+    rows = [[1]]
+    for p in range(1, n + 1):
+        prev = rows[-1] + [0]
+        rows.append([0] + [i * prev[i] + prev[i - 1] for i in range(1, p + 1)])
+    return rows
+
+
+def _to_binomial(spec):
+    """Binomial-basis coefficients b with sum_p c_p x^p = sum_i b_i C(x, i)."""
+    coeffs = [0] * spec + [1] if isinstance(spec, int) else list(spec)
+    stirling = _stirling2(len(coeffs) - 1)
+    b = [Fraction(0)] * len(coeffs)
+    for p, c in enumerate(coeffs):
+        for i in range(p + 1):
+            b[i] += Fraction(c) * stirling[p][i] * factorial(i)
+    if any(x.denominator != 1 for x in b):
+        raise ValueError("polynomial is not integer-valued")
+    return [int(x) for x in b]
+
+
+def _wrap(c):
+    """c modulo 2^64 as a signed int64 value, matching int64 wraparound."""
+    return (c + (1 << 63)) % _WRAP - (1 << 63)
+
+
+def _binomial(x, r, mod):
+    """C(x, r) elementwise for an int64 array x, exact (mod=None) or mod < 2^31."""
+    factors = [x - i for i in range(r)]
+    # The r consecutive factors hold at least v_p(r!) powers of every p <= r
+    for p in primes_up_to(r).tolist():
+        rem = np.full(x.shape, sum(r // p ** e for e in range(1, r.bit_length() + 1)), dtype=np.int64)
+        for f in factors:
+            while True:
+                hit = (rem > 0) & (f % p == 0)
+                if not hit.any():
+                    break
+                np.floor_divide(f, p, out=f, where=hit)
+                rem -= hit
+    out = np.ones(x.shape, dtype=np.int64)
+    for f in factors:
+        out = out * f if mod is None else out * (f % mod) % mod
+    return out
+
+
+class _Poly:
+    """
+    sum_i b_i C(x, i), evaluated in int64, float64 or object arithmetic.
+
+    For int64 the argument is split as x = qL + t with L = d! (d the degree).
+    By Vandermonde C(x, i) = sum_j C(qL, j) C(t, i - j), and
+    C(qL, j) = q (L / j!) (qL - 1) ... (qL - j + 1) needs no division, so the
+    polynomial is sum_j C(qL, j) H_j[t] with small tables H_j over t < L.
+    Without a modulus the tables are only used while every entry fits in
+    int64 (degree <= 6 for plain powers); otherwise, and for larger d, the
+    binomials are evaluated one by one with exact cancellation.
+    """
+
+    def __init__(self, b):
+        self.b = b
+        self.degree = len(b) - 1
+        self.period = factorial(self.degree)
+        self.tables = None
+        self.tables_fit = False
+        if self.period <= _TABLE_LIMIT:
+            self.tables = [[sum(b[i] * comb(t, i - j) for i in range(j, len(b)))
+                            for t in range(self.period)] for j in range(len(b))]
+            self.tables_fit = max(abs(h) for table in self.tables for h in table) <= _INT64_MAX
+
+    def prefix(self):
+        """Q with Q(j + 1) = sum_{k=1}^{j} P(k), via sum_{k<=j} C(k, i) = C(j+1, i+1)."""
+        return _Poly([-self.b[0]] + self.b)
+
+    def exact(self, x, mod):
+        if self.tables is None or (mod is None and not self.tables_fit):
+            return self._exact_cancelled(x, mod)
+        L = self.period
+        reduce = (lambda a: a) if mod is None else (lambda a: a % mod)
+        tables = [np.array([reduce(h) for h in table], dtype=np.int64) for table in self.tables]
+        q, t = np.divmod(x, L)
+        qL = x - t
+        q = reduce(q)
+        out = tables[0][t]
+        run = np.ones(x.shape, dtype=np.int64)  # (qL - 1) ... (qL - j + 1)
+        for j in range(1, self.degree + 1):
+            binom = reduce(reduce(q * reduce(L // factorial(j))) * run)
+            out = reduce(out + reduce(binom * tables[j][t]))
+            run = reduce(run * reduce(qL - j))
+        return out
+
+    def _exact_cancelled(self, x, mod):
+        out = np.zeros(x.shape, dtype=np.int64)
+        for i, c in enumerate(self.b):
+            if c == 0:
+                continue
+            if mod is None:
+                out += _wrap(c) * _binomial(x, i, None)
+            else:
+                out = (out + c % mod * _binomial(x, i, mod)) % mod
+        return out
+
+    def shadow(self, x):
+        x = x.astype(np.float64)
+        out = np.zeros(x.shape)
+        term = np.ones(x.shape)
+        for i, c in enumerate(self.b):
+            if i:
+                term = term * (x - (i - 1)) / i
+            out += c * term
+        return out
+
+    def obj(self, x):
+        out = np.zeros(x.shape, dtype=object)
+        term = np.ones(x.shape, dtype=object)
+        for i, c in enumerate(self.b):
+            if i:
+                term = term * (x - (i - 1)) // i
+            out += c * term
+        return out
+
+
+@cache
+def _poly(spec):
+    """_Poly for an exponent or coefficient tuple, built once (tables are costly for d >= 7)."""
+    return _Poly(_to_binomial(spec))
+
+
+@cache
+def _prefix_poly(spec):
+    return _poly(spec).prefix()
+
+
+def _spec_key(spec):
+    return spec if isinstance(spec, int) else tuple(spec)
+
+
+def _weight_prefix(weight):
+    """Callable W(j) (any arithmetic) or the _Poly Q with W(j) = Q(j + 1)."""
+    return weight if callable(weight) else _prefix_poly(_spec_key(weight))
+
+
+def _value_fn(f):
+    return f if callable(f) else _poly(_spec_key(f))
+
+
+def power_prefix_sum(x, power, mod=None):
+    """
+    sum_{k=1}^{x} k^power for every entry of an int64 array x >= 0, as int64
+    reduced modulo mod (< 2^31), or with mod=None modulo 2^64 (wrapping), which
+    is exact whenever the sums fit in int64.
+    """
+    return _weight_prefix(power).exact(np.asarray(x, dtype=np.int64) + 1, mod)
+
+
+def _prefix_values(edges, W, mod):
+    """W at every edge: int64 (exact or reduced) when safe, else object."""
+    if isinstance(W, _Poly):
+        if mod is not None and mod < _INT64_MOD_LIMIT:
+            return W.exact(edges + 1, mod)
+        if mod is None and np.abs(W.shadow(edges + 1)).max(initial=0) < _SAFE:
+            return W.exact(edges + 1, None)
+        values = W.obj(edges.astype(object) + 1)
+    elif mod is not None and mod < _INT64_MOD_LIMIT:
+        return W(edges) % mod
+    else:
+        values = W(edges.astype(object))
+    return values if mod is None else values % mod
+
+
+def _terms(dw, value, F, mod):
+    """Per-block contributions dw * F(value), reduced if mod."""
+    if mod is not None and mod < _INT64_MOD_LIMIT:
+        fv = F.exact(value, mod) if isinstance(F, _Poly) else F(value) % mod
+        return dw % mod * fv % mod
+    if mod is None and dw.dtype != object and isinstance(F, _Poly):
+        fs = F.shadow(value)
+        if np.abs(fs).max(initial=0) < _SAFE \
+                and (np.abs(dw.astype(np.float64)) * np.abs(fs)).sum() < _SAFE:
+            return dw * F.exact(value, None)
+    value = value.astype(object)
+    terms = dw.astype(object) * (F.obj(value) if isinstance(F, _Poly) else F(value))
+    return terms if mod is None else terms % mod
+
+
+def block_sum(N, f=1, weight=0, mod=None, chunk=DEFAULT_CHUNK):
+    """
+    sum_{k=1}^{N} w(k) * f(floor(N/k)) in O(sqrt N), modulo mod if given.
+
+    f and weight are exponents, coefficient sequences or callables (see the
+    module docstring); the defaults give sum_k floor(N/k).
+    """
+    W, F = _weight_prefix(weight), _value_fn(f)
+    total = 0
+    for edges, value in _edge_chunks(N, chunk):
+        dw = np.diff(_prefix_values(edges, W, mod))
+        total += int(_terms(dw, value, F, mod).sum())
+        if mod is not None:
+            total %= mod
+    return total
+
+
+def block_sum_many(Ns, f=1, weight=0, mod=None, chunk=DEFAULT_CHUNK):
+    """
+    block_sum for every N in Ns, as an array aligned with Ns (int64 with a
+    modulus, object without).
+
+    Repeated N are evaluated once, and the blocks of many small N are
+    concatenated so each chunk is a single vectorised evaluation.
+    """
+    Ns = np.asarray(Ns, dtype=np.int64)
+    unique, inverse = np.unique(Ns, return_inverse=True)
+    W, F = _weight_prefix(weight), _value_fn(f)
+    results = [0] * len(unique)
+    pending, size = [], 0
+
+    def flush():
+        edges = np.concatenate([e for _, e, _ in pending])
+        value = np.concatenate([v for _, _, v in pending])
+        owners = np.concatenate([np.full(len(v), i, dtype=np.int64) for i, _, v in pending])
+        # Differences across two pieces' edge arrays are dropped
+        inner = np.ones(len(edges) - 1, dtype=bool)
+        inner[np.cumsum([len(e) for _, e, _ in pending])[:-1] - 1] = False
+        dw = np.diff(_prefix_values(edges, W, mod))[inner]
+        terms = _terms(dw, value, F, mod)
+        # owners are non-decreasing, so each owner is one contiguous segment
+        firsts = np.concatenate(([0], np.flatnonzero(np.diff(owners)) + 1))
+        for owner, seg in zip(owners[firsts], np.add.reduceat(terms, firsts)):
+            results[owner] += int(seg)
+            if mod is not None:
+                results[owner] %= mod
+        pending.clear()
+
+    for i, N in enumerate(unique):
+        for edges, value in _edge_chunks(int(N), chunk):
+            pending.append((i, edges, value))
+            size += len(value)
+            if size >= chunk:
+                flush()
+                size = 0
+    if pending:
+        flush()
+    out = np.array(results, dtype=np.int64 if mod is not None else object)
+    return out[inverse]
+
+
+if __name__ == "__main__":
+    # Brute-force checks, including degrees whose int64 tables would overflow
+    for N in (10, 1000):
+        for f, weight in ((1, 0), (2, 1), (7, 0), (8, 0), (1, 6), (3, 5)):
+            expected = sum(k ** weight * (N // k) ** f for k in range(1, N + 1))
+            assert block_sum(N, f, weight) == expected, (N, f, weight)
+            assert block_sum(N, f, weight, 10**9 + 7) == expected % (10**9 + 7), (N, f, weight)
+    assert power_prefix_sum(np.arange(20), 8).tolist() == [sum(k ** 8 for k in range(1, x + 1)) for x in range(20)]
+    print(block_sum(10**10, 1, 2, 10**9))
@@ -0,0 +1,125 @@
+"""
+Layered digit DP over NumPy arrays.
+
+A problem is declared by
+
+* initial: a tuple of ints, the state before any digit is placed,
+* transition(position, state, digit) -> new state, where state is a tuple of
+  int64 arrays (one per component) and position counts from the least
+  significant digit, 0 first,
+* accept(state) -> per-state weight (bool for "accepted", or an integer
+  array such as a digit count to be summed).
+
+The engine places the digits least significant first (so carries flow the
+natural way), expands every state by every allowed digit at once, and then
+merges equal states, summing their multiplicities.  The merge is the state
+compression: a component declared as a difference (s_n - s_137n rather than
+the two sums) collapses whole families of paths into one row, and the layer
+never holds more rows than there are distinct states.  Equal rows are
+found by packing each row into one int64 key when the component ranges
+allow it, and with np.unique(axis=0) otherwise.
+
+An optional upper bound restricts the numbers to 0..upper by a hidden
+"suffix exceeds the bound's suffix" flag, which is what an LSB-first
+comparison needs.  with_sum additionally tracks the weighted sum of the
+numbers themselves.
+"""
+import numpy as np
+
+_KEY_LIMIT = 1 << 62
+
+
+def _exact_dtype(bound):
+    return np.int64 if bound < _KEY_LIMIT else object
+
+
+def _merge(columns, counts, totals):
+    """Collapse equal state rows, summing counts (and totals)."""
+    if columns:
+        low = [c.min() for c in columns]
+        spans = [int(c.max()) - int(m) + 1 for c, m in zip(columns, low)]
+        span = 1
+        for s in spans:
+            span *= s
+        if span < _KEY_LIMIT:
+            key = np.zeros(counts.size, dtype=np.int64)
+            for c, m, s in zip(columns, low, spans):
+                key = key * s + (c - m)
+            _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+        else:
+            _, first, inverse = np.unique(np.stack(columns, axis=1), axis=0,
+                                          return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+    else:
+        first = np.zeros(min(counts.size, 1), dtype=np.int64)
+        inverse = np.zeros(counts.size, dtype=np.int64)
+    order = np.argsort(inverse, kind="stable")
+    starts = np.flatnonzero(np.diff(inverse[order], prepend=-1))
+    merged = tuple(c[first] for c in columns)
+    counts = np.add.reduceat(counts[order], starts)
+    if totals is not None:
+        totals = np.add.reduceat(totals[order], starts)
+    return merged, counts, totals
+
+
+def digit_dp(length, initial, transition, accept, digits=None, upper=None, base=10, with_sum=False):
+    """
+    Weighted count of the length-digit strings (leading zeros allowed)
+    accepted by the declared DP; with with_sum, also the weighted sum of
+    the numbers they spell, returned as (count, total).
+
+    digits(position) gives the digits allowed at a position (default all),
+    e.g. range(1, base) at position length - 1 for no leading zero.  With
+    upper only numbers <= upper count, and length defaults to its width.
+    Results are Python ints.
+    """
+    if length is None:
+        length = len(np.base_repr(upper, base))
+    if digits is None:
+        digits = lambda position: range(base)
+    bound = [] if upper is None else [int(c, base) for c in reversed(np.base_repr(upper, base))]
+    if len(bound) > length:
+        raise ValueError("upper has more digits than length")
+    bound += [0] * (length - len(bound))
+
+    count_dtype = _exact_dtype(base ** length)
+    sum_dtype = _exact_dtype(base ** (2 * length))
+    columns = tuple(np.array([v], dtype=np.int64) for v in initial)
+    if upper is not None:
+        columns += (np.zeros(1, dtype=np.int64),)  # suffix > bound's suffix
+    counts = np.ones(1, dtype=count_dtype)
+    totals = np.zeros(1, dtype=sum_dtype) if with_sum else None
+    place = 1
+    for position in range(length):
+        user, over = (columns[:-1], columns[-1]) if upper is not None else (columns, None)
+        grown, grown_counts, grown_totals = [], [], []
+        for digit in digits(position):
+            state = tuple(np.asarray(c, dtype=np.int64) for c in transition(position, user, digit))
+            state = tuple(np.broadcast_to(c, counts.shape) for c in state)
+            if upper is not None:
+                b = bound[position]
+                flag = np.full(counts.shape, 1 if digit > b else 0, dtype=np.int64)
+                state += (over if digit == b else flag,)
+            grown.append(state)
+            grown_counts.append(counts)
+            if with_sum:
+                grown_totals.append(totals + counts.astype(sum_dtype) * (digit * place))
+        if not grown:
+            return (0, 0) if with_sum else 0
+        columns = tuple(np.concatenate(parts) for parts in zip(*grown))
+        columns, counts, totals = _merge(
+            columns, np.concatenate(grown_counts), np.concatenate(grown_totals) if with_sum else None)
+        place *= base
+
+    if upper is not None:
+        keep = columns[-1] == 0
+        columns = tuple(c[keep] for c in columns[:-1])
+        counts = counts[keep]
+        totals = totals[keep] if with_sum else None
+    # The weights are arbitrary integers, so the final products are Python ints
+    weight = np.broadcast_to(np.asarray(accept(columns)), counts.shape)
+    weight = weight.astype(np.int64).astype(object)
+    count = int((counts.astype(object) * weight).sum())
+    if not with_sum:
+        return count
+    return count, int((totals.astype(object) * weight).sum())
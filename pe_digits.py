@@ -0,0 +1,87 @@
+"""
+Streaming long division: the decimal digits of a/d, many at a time.
+
+One step of schoolbook division turns a remainder r into the next digit
+10r // d and the remainder 10r % d.  k steps at once are
+
+    block, r = divmod(r * 10^k, d)
+
+where block is the next k digits read as one k-digit (zero-padded) integer.
+digit_blocks yields those blocks and keeps only the current remainder, and
+expansion_summary folds them into running aggregates (digit sum, leading
+and trailing digits).  Memory stays bounded (one batch of blocks) however
+many digits are taken, and with the default k = 18 there are 18x fewer
+Python-level steps than with one digit per iteration.
+"""
+import numpy as np
+
+DEFAULT_BLOCK = 18
+# Blocks of up to 18 digits fit in int64, so their digit sums can be batched
+_INT64_DIGITS = 18
+_BATCH = 1 << 16
+
+
+def digit_sum(n):
+    """Sum of the decimal digits of n >= 0."""
+    return sum(map(int, str(n)))
+
+
+def _digit_sums(blocks):
+    """Total digit sum of a list of ints below 10^18, vectorised."""
+    values = np.array(blocks, dtype=np.int64)
+    total = 0
+    while values.any():
+        values, low = np.divmod(values, 10)
+        total += int(low.sum())
+    return total
+
+
+def digit_blocks(a, d, count, k=DEFAULT_BLOCK, fill=0):
+    """
+    Yield (block, width) for the first count digits after the point of a/d.
+
+    block holds the next width digits (width = k except possibly the last),
+    so str(block).zfill(width) spells them out.  Each division step brings
+    down the digit fill, 0 for the expansion of a/d; a = 0, fill = 9 gives
+    the count-digit quotient (10^count - 1) // d, zero-padded.
+    """
+    r = a % d
+    scale = 10 ** k
+    carry_in = fill * (scale - 1) // 9  # k copies of the fill digit
+    for _ in range(count // k):
+        block, r = divmod(r * scale + carry_in, d)
+        yield block, k
+    if count % k:
+        tail = 10 ** (count % k)
+        block, r = divmod(r * tail + fill * (tail - 1) // 9, d)
+        yield block, count % k
+
+
+def expansion_summary(a, d, count, keep=10, k=DEFAULT_BLOCK, fill=0):
+    """
+    (digit sum, first keep digits, last keep digits) of the first count
+    digits after the point of a/d (fill as in digit_blocks); the digit
+    lists are ints, most significant first.  Blocks are buffered _BATCH at
+    a time so their digit sums are taken with NumPy rather than per block.
+    """
+    total = 0
+    head = ""
+    tail, tail_width = 0, 0
+    tail_mod = 10 ** keep
+    pending = []
+    for block, width in digit_blocks(a, d, count, k, fill):
+        if k > _INT64_DIGITS:
+            total += digit_sum(block)
+        else:
+            pending.append(block)
+            if len(pending) == _BATCH:
+                total += _digit_sums(pending)
+                pending.clear()
+        if len(head) < keep:
+            head += str(block).zfill(width)
+        tail = (tail * 10 ** width + block) % tail_mod
+        tail_width = min(keep, tail_width + width)
+    if pending:
+        total += _digit_sums(pending)
+    tail_digits = str(tail).zfill(tail_width) if tail_width else ""
+    return total, [int(c) for c in head[:keep]], [int(c) for c in tail_digits]
@@ -0,0 +1,153 @@
+"""
+Factoring integers beyond the range of a sieve table.
+
+* A small-prime pre-pass takes gcd(n, product of the primes below
+  SMALL_PRIME_BOUND) and strips those primes; once the cofactor fits in the
+  shared smallest-prime-factor table (pe_spf) the rest is table lookups.
+* Miller-Rabin with the bases 2, 325, 9375, 28178, 450775, 9780504,
+  1795265022 is deterministic below 2^64.
+* Brent's variant of Pollard's rho splits the remaining composites, batching
+  the gcds over blocks of iterations.
+
+factor_stream farms an iterable out to a process pool and yields the
+factorisations in input order; each worker builds (or memory-maps) its own
+copy of the table once.
+"""
+import multiprocessing as mp
+from math import gcd, isqrt, prod
+
+from pe_spf import factorize, spf_table
+
+DEFAULT_SPF_LIMIT = 1 << 20
+SMALL_PRIME_BOUND = 1 << 10
+
+_MR_BASES = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+
+_spf = None
+_small_primes = None
+_small_bound = None
+_primorial = None
+
+
+def _init_tables(spf_limit=DEFAULT_SPF_LIMIT, spf_path=None):
+    """Load the table shared by every factorisation in this process."""
+    global _spf, _small_primes, _small_bound, _primorial
+    _spf = spf_table(spf_limit, spf_path)
+    _small_bound = min(SMALL_PRIME_BOUND, len(_spf) - 1)
+    _small_primes = [p for p in range(2, _small_bound + 1) if _spf[p] == p]
+    _primorial = prod(_small_primes)
+
+
+def is_prime(n):
+    """Deterministic Miller-Rabin for n < 2^64 (a strong probable-prime test above)."""
+    if n < 2:
+        return False
+    for p in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a % n, d, n)
+        if x in (0, 1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_brent(n):
+    """A non-trivial factor of an odd composite n (Brent's cycle, batched gcds)."""
+    if n % 2 == 0:
+        return 2
+    root = isqrt(n)
+    if root * root == n:
+        return root
+    block = 128
+    for c in range(1, n):
+        y, r, q, g = 2, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                saved = y
+                for _ in range(min(block, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = gcd(q, n)
+                k += block
+            r *= 2
+        if g == n:
+            # The batch overshot: replay it one step at a time
+            g = 1
+            while g == 1:
+                saved = (saved * saved + c) % n
+                g = gcd(abs(x - saved), n)
+        if g != n:
+            return g
+    raise ValueError(f"no factor found for {n}")
+
+
+def _split(n, factors):
+    """Add the prime factorisation of n (no prime factors below the pre-pass bound)."""
+    if n == 1:
+        return
+    if n < len(_spf):
+        for p, e in factorize(n, _spf).items():
+            factors[p] = factors.get(p, 0) + e
+        return
+    if n <= _small_bound * _small_bound or is_prime(n):
+        factors[n] = factors.get(n, 0) + 1
+        return
+    d = pollard_brent(n)
+    _split(d, factors)
+    _split(n // d, factors)
+
+
+def factorint(n):
+    """{prime: exponent} for n >= 1, sorted by prime."""
+    if _spf is None:
+        _init_tables()
+    if n < 1:
+        raise ValueError("n must be a positive integer")
+    if n < len(_spf):
+        return factorize(n, _spf)
+    factors = {}
+    g = gcd(n, _primorial)
+    if g > 1:
+        for p in _small_primes:
+            if g % p == 0:
+                e = 0
+                while n % p == 0:
+                    n //= p
+                    e += 1
+                factors[p] = e
+    _split(n, factors)
+    return dict(sorted(factors.items()))
+
+
+def factor_stream(values, processes=None, chunksize=1024, spf_limit=DEFAULT_SPF_LIMIT, spf_path=None):
+    """
+    Yield factorint(v) for every v in values, in order, using a process pool.
+
+    values may be any (lazy) iterable; chunksize values travel per task.
+    With spf_path the workers memory-map one saved table instead of each
+    building its own.
+    """
+    if spf_path is not None:
+        spf_table(spf_limit, spf_path)  # build and save once, before the workers map it
+    with mp.Pool(processes, initializer=_init_tables, initargs=(spf_limit, spf_path)) as pool:
+        yield from pool.imap(factorint, values, chunksize=chunksize)
+
+
+if __name__ == "__main__":
+    print(factorint(2 ** 4 * 3 * 1000003 * 998244353))
+    print(list(factor_stream(range(4 * 10**12, 4 * 10**12 + 5), processes=2)))
@@ -0,0 +1,139 @@
+"""
+Modular matrix multiplication and exponentiation shared by the Python solutions.
+
+The product is always computed with float64 BLAS matmuls on integer-valued
+operands that are small enough for every partial sum to stay below 2^53, so
+the result is exact:
+
+* if n * (mod - 1)^2 < 2^53 the reduced matrices are multiplied directly;
+* otherwise (mod < 2^62) both operands are split into w-bit limbs and the
+  limb products are recombined with a Horner scheme in int64;
+* anything else (mod >= 2^62 or mod=None) falls back to dtype=object.
+"""
+import numpy as np
+
+_EXACT_BITS = 53
+_INT64_MOD_LIMIT = 1 << 62
+
+
+def _prepare(A, mod):
+    """Reduce A modulo mod into int64 (or object when int64 cannot hold it)."""
+    if not isinstance(A, np.ndarray):
+        # np.asarray would turn a list mixing ints >= 2^63 with small ones into float64
+        A = np.array(A, dtype=object)
+    if A.dtype.kind == "f":
+        raise TypeError("matrix entries must be integers, not floats")
+    if mod is None:
+        return A.astype(object)
+    if A.dtype.kind == "i" and mod < _INT64_MOD_LIMIT:
+        return np.mod(A.astype(np.int64), mod)
+    reduced = np.mod(A.astype(object), mod)
+    if mod < _INT64_MOD_LIMIT:
+        return reduced.astype(np.int64)
+    return reduced
+
+
+def shift_mod(C, bits, mod):
+    """(C << bits) % mod for int64 C in [0, mod), never overflowing."""
+    step = 63 - mod.bit_length()
+    while bits > 0:
+        s = min(step, bits)
+        C = (C << s) % mod
+        bits -= s
+    return C
+
+
+def _mul(A, B, mod):
+    """Product of two already-reduced operands."""
+    if mod is None:
+        return np.matmul(A, B)
+    if A.dtype == object:
+        return np.matmul(A, B) % mod
+
+    n = A.shape[-1]
+    if n * (mod - 1) ** 2 < (1 << _EXACT_BITS):
+        C = np.matmul(A.astype(np.float64), B.astype(np.float64))
+        return np.rint(C).astype(np.int64) % mod
+
+    # n products of two w-bit limbs must sum to less than 2^53
+    w = (_EXACT_BITS - n.bit_length()) // 2
+    if w < 1:
+        return np.matmul(A.astype(object), B.astype(object)) % mod
+    limbs = -(-mod.bit_length() // w)
+    mask = (1 << w) - 1
+    A_limbs = [((A >> (w * i)) & mask).astype(np.float64) for i in range(limbs)]
+    B_limbs = [((B >> (w * i)) & mask).astype(np.float64) for i in range(limbs)]
+
+    partial = [0] * (2 * limbs - 1)
+    for i, Ai in enumerate(A_limbs):
+        for j, Bj in enumerate(B_limbs):
+            P = np.rint(np.matmul(Ai, Bj)).astype(np.int64) % mod
+            partial[i + j] = (partial[i + j] + P) % mod
+
+    C = partial[-1]
+    for P in reversed(partial[:-1]):
+        C = (shift_mod(C, w, mod) + P) % mod
+    return C
+
+
+def mat_mul_mod(A, B, mod=None):
+    """A @ B modulo mod (exact integer product when mod is None)."""
+    return _mul(_prepare(A, mod), _prepare(B, mod), mod)
+
+
+def _identity(n, like):
+    I = np.zeros((n, n), dtype=like.dtype)
+    for i in range(n):
+        I[i, i] = 1
+    return I
+
+
+def mat_pow_mod(M, power, mod=None):
+    """M^power modulo mod by binary exponentiation."""
+    power = int(power)
+    base = _prepare(M, mod)
+    result = _identity(base.shape[0], base)
+    if mod is not None:
+        result %= mod
+    while power > 0:
+        if power & 1:
+            result = _mul(result, base, mod)
+        power >>= 1
+        if power:
+            base = _mul(base, base, mod)
+    return result
+
+
+def mat_pow_vec_mod(M, power, v, mod=None):
+    """
+    M^power @ v modulo mod without ever forming M^power.
+
+    The squarings of M are still needed, but every odd bit is applied with a
+    matrix-vector product, and small powers are just iterated mat-vecs.  For a
+    row vector (v @ M^power) pass M.T.
+    """
+    power = int(power)
+    base = _prepare(M, mod)
+    v = _prepare(v, mod)
+    if power <= base.shape[0] * max(power.bit_length(), 1):
+        for _ in range(power):
+            v = _mul(base, v, mod)
+        return v
+    while power > 0:
+        if power & 1:
+            v = _mul(base, v, mod)
+        power >>= 1
+        if power:
+            base = _mul(base, base, mod)
+    return v
+
+
+if __name__ == "__main__":
+    # Python-int entries in [2^63, 2^64) must not pass through float64
+    big = [[2**63 + 5, 1], [0, 1]]
+    for m in (2**64 + 13, 10**20 + 39):
+        assert mat_mul_mod(big, big, m)[0, 0] == (2**63 + 5) ** 2 % m
+        assert mat_mul_mod(big, big, m)[0, 1] == (2**63 + 6) % m
+    fib = np.array([[1, 1], [1, 0]])
+    print(mat_pow_mod(fib, 10**18, 10**9 + 7)[0, 1])
+    print(mat_pow_vec_mod(fib, 90, [1, 0])[1])
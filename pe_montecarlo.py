@@ -0,0 +1,117 @@
+"""
+Multi-process Monte Carlo harness shared by the simulation scripts.
+
+A sampler is any picklable function sample_fn(rng, n) returning n samples as
+an array.  Work is handed out in chunks; every chunk gets its own numpy
+Generator seeded from SeedSequence(seed).spawn, so streams are independent
+and a run is reproducible for a fixed seed, chunk size and process count.
+Each chunk comes back as a RunningStats (mean / M2 / count) and the partial
+results are merged in submission order.  The run stops once the 95% confidence
+half-width falls below the requested target.
+"""
+import multiprocessing as mp
+from math import sqrt
+
+import numpy as np
+
+Z_95 = 1.959963984540054
+
+
+class RunningStats:
+    """Mean and variance accumulated batch by batch (Chan/Welford merge)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def merge(self, count, mean, m2):
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def add_batch(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        batch_mean = float(values.mean())
+        self.merge(values.size, batch_mean, float(((values - batch_mean) ** 2).sum()))
+
+    def add_stats(self, other):
+        self.merge(other.count, other.mean, other.m2)
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def sample_variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else float("inf")
+
+    def half_width(self, z=Z_95):
+        """Half-width of the normal confidence interval for the mean."""
+        return z * sqrt(self.sample_variance / self.count) if self.count > 1 else float("inf")
+
+
+def run_chunk(sample_fn, seed_seq, trials, batch_size):
+    """Worker body: trials samples from a private generator, as RunningStats."""
+    rng = np.random.default_rng(seed_seq)
+    stats = RunningStats()
+    while trials > 0:
+        n = min(batch_size, trials)
+        stats.add_batch(sample_fn(rng, n))
+        trials -= n
+    return stats
+
+
+def run_until(sample_fn, target_half_width, seed=None, processes=None,
+              chunk_size=1 << 20, batch_size=1 << 16, min_trials=None,
+              max_trials=None, verbose=True):
+    """
+    Sample until the 95% half-width is below target_half_width.
+
+    Keeps one chunk in flight per process and re-checks the merged estimate
+    after every finished chunk.  min_trials (default: one chunk per process)
+    guards against stopping on a lucky early variance estimate; max_trials
+    caps the run.  Returns the merged RunningStats.
+    """
+    processes = processes or mp.cpu_count()
+    min_trials = processes * chunk_size if min_trials is None else min_trials
+    root = np.random.SeedSequence(seed)
+    stats = RunningStats()
+
+    def done():
+        if max_trials is not None and stats.count >= max_trials:
+            return True
+        return stats.count >= min_trials and stats.half_width() < target_half_width
+
+    submitted = 0
+    with mp.Pool(processes=processes) as pool:
+        pending = []
+
+        def submit():
+            nonlocal submitted
+            trials = chunk_size
+            if max_trials is not None:
+                trials = min(trials, max_trials - submitted)
+            if trials <= 0:
+                return
+            child = root.spawn(1)[0]
+            pending.append(pool.apply_async(run_chunk, (sample_fn, child, trials, batch_size)))
+            submitted += trials
+
+        for _ in range(processes):
+            submit()
+        while pending and not done():
+            result = pending.pop(0).get()
+            stats.add_stats(result)
+            if verbose:
+                print(f"  {stats.count:,} trials: {stats.mean:.8f} ± {stats.half_width():.2e}")
+            if not done():
+                submit()
+        pool.terminate()
+    return stats
@@ -0,0 +1,202 @@
+"""
+Multiplicative orders ord_K(base) in bulk, driven by a smallest-prime-factor table.
+
+For a prime p not dividing the base, ord_p divides lambda(p) = p - 1, whose
+factorisation comes from the table.  For every prime q | p - 1, the q-part
+of the order is found by stripping q from p - 1 while base^((p-1)/q^k) is
+still 1 modulo p.  Each q is independent, so all (p, q) pairs advance
+together as NumPy arrays.  Higher prime powers lift with
+ord_{p^e} in {ord_{p^(e-1)}, p * ord_{p^(e-1)}}.  The orders of all prime
+powers up to the limit are memoised in one array, and a composite K
+(coprime to the base) takes the lcm over its prime-power factors.
+
+order_table / period_table / carmichael_table expand that into plain
+arrays indexed by the modulus, for scripts that look up many periods.
+"""
+from math import isqrt, lcm
+
+import numpy as np
+
+from pe_factor import factorint
+from pe_sieve import primes_up_to
+from pe_spf import factor_many, spf_table
+
+_CHUNK = 1 << 20
+
+
+_DIRECT_MUL_LIMIT = 3037000499  # isqrt(2^63 - 1): a * b fits in int64 below this
+_SPLIT_MUL_LIMIT = 1 << 55
+
+
+def _mul_mod(a, b, modulus, split):
+    """a * b % modulus elementwise; split does it in 8-bit digits of b for moduli < 2^55."""
+    if not split:
+        return a * b % modulus
+    # Horner over the bytes of b in uint64: r * 2^8 + a * digit < 2^64 for m < 2^55
+    a, b, m = a.astype(np.uint64), b.astype(np.uint64), modulus.astype(np.uint64)
+    result = np.zeros(np.shape(a), dtype=np.uint64)
+    for shift in range(48, -8, -8):
+        digit = (b >> np.uint64(shift)) & np.uint64(0xFF)
+        result = ((result << np.uint64(8)) % m + a * digit) % m
+    return result.astype(np.int64)
+
+
+def pow_mod_many(base, exponent, modulus):
+    """Elementwise base^exponent % modulus for int64 arrays (modulus < 2^55)."""
+    shape = np.broadcast_shapes(np.shape(base), np.shape(exponent), np.shape(modulus))
+    modulus = np.broadcast_to(np.asarray(modulus, dtype=np.int64), shape)
+    top = int(modulus.max(initial=1))
+    if top >= _SPLIT_MUL_LIMIT:
+        raise ValueError("moduli must be below 2^55")
+    split = top > _DIRECT_MUL_LIMIT
+    base = np.broadcast_to(np.asarray(base, dtype=np.int64), shape) % modulus
+    result = np.ones(shape, dtype=np.int64) % modulus
+    exponent = np.array(np.broadcast_to(exponent, shape), dtype=np.int64)
+    while exponent.any():
+        odd = (exponent & 1) == 1
+        result = np.where(odd, _mul_mod(result, base, modulus, split), result)
+        exponent >>= 1
+        base = _mul_mod(base, base, modulus, split)
+    return result
+
+
+def _prime_orders(base, primes, spf):
+    """ord_p(base) for an int64 array of primes not dividing base."""
+    t = primes - 1
+    row, q, e = factor_many(np.maximum(t, 1), spf)
+    modulus = primes[row]
+    stripped = np.ones(row.size, dtype=np.int64)  # q^k removed so far
+    live = np.ones(row.size, dtype=bool)
+    for _ in range(int(e.max(initial=0))):
+        live &= e > 0
+        if not live.any():
+            break
+        at = np.flatnonzero(live)
+        candidate = t[row[at]] // (stripped[at] * q[at])
+        one = pow_mod_many(base % modulus[at], candidate, modulus[at]) == 1
+        stripped[at[one]] *= q[at[one]]
+        e[at] -= 1
+        live[at[~one]] = False
+    divisor = np.ones(primes.size, dtype=np.int64)
+    np.multiply.at(divisor, row, stripped)
+    return np.maximum(t // divisor, 1)
+
+
+class OrderTable:
+    """
+    ord_K(base) for every K <= limit coprime to base.
+
+    The SPF table may be memory-mapped from spf_path; the prime-power
+    orders are the plain arrays power_values / power_orders.
+    """
+
+    def __init__(self, base, limit, spf_path=None):
+        self.base, self.limit = base, limit
+        self.spf = spf_table(limit, spf_path)
+        primes = primes_up_to(limit)
+        primes = primes[base % primes != 0]
+        orders = _prime_orders(base, primes, self.spf)
+
+        # Lift to p^e for the few primes with p^2 <= limit
+        values, lifted = [primes], [orders]
+        for p, order in zip(primes[primes <= isqrt(limit)].tolist(), orders.tolist()):
+            power = p * p
+            while power <= limit:
+                if pow(base, order, power) != 1:
+                    order *= p
+                values.append(np.array([power]))
+                lifted.append(np.array([order]))
+                power *= p
+        values, lifted = np.concatenate(values), np.concatenate(lifted)
+        sort = np.argsort(values)
+        self.power_values, self.power_orders = values[sort], lifted[sort]
+
+    def orders(self, values):
+        """int64 array of ord_K(base) for K in values (1 <= K <= limit, gcd(K, base) = 1)."""
+        values = np.asarray(values, dtype=np.int64)
+        row, p, e = factor_many(values, self.spf)
+        slot = np.searchsorted(self.power_values, p ** e)
+        if slot.size and (slot.max() >= self.power_values.size
+                          or (self.power_values[slot] != p ** e).any()):
+            raise ValueError("values must be coprime to the base")
+        result = np.ones(values.size, dtype=np.int64)
+        if row.size:
+            firsts = np.flatnonzero(np.diff(row, prepend=-1))
+            result[row[firsts]] = np.lcm.reduceat(self.power_orders[slot], firsts)
+        return result
+
+
+def multiplicative_order(base, K, table=None):
+    """ord_K(base) for a single K (0 if gcd(K, base) > 1), via table when given."""
+    if table is None:
+        return order_dividing(base, K, carmichael(K))
+    return int(table.orders([K])[0])
+
+
+def carmichael(n):
+    """lambda(n) for a single n >= 1, from its factorisation."""
+    result = 1
+    for p, e in factorint(n).items():
+        # lambda(p^e) = phi(p^e), except 2^(e-2) for 2^e with e >= 3
+        lam = (p - 1) * p ** (e - 1)
+        result = lcm(result, lam // 2 if p == 2 and e >= 3 else lam)
+    return result
+
+
+def order_dividing(base, modulus, multiple):
+    """
+    ord_modulus(base) given any multiple of it (lambda(modulus), or a target
+    order); 0 when base^multiple != 1 (mod modulus).  Works for moduli far
+    beyond a table, since only multiple is factorised.
+    """
+    if pow(base, multiple, modulus) != 1 % modulus:
+        return 0
+    order = multiple
+    for q in factorint(multiple):
+        while order % q == 0 and pow(base, order // q, modulus) == 1 % modulus:
+            order //= q
+    return order
+
+
+def order_table(base, limit, spf_path=None):
+    """int64 array t with t[K] = ord_K(base) for 1 <= K <= limit (0 if gcd(K, base) > 1)."""
+    table = OrderTable(base, limit, spf_path)
+    result = np.zeros(limit + 1, dtype=np.int64)
+    for lo in range(1, limit + 1, _CHUNK):
+        K = np.arange(lo, min(lo + _CHUNK, limit + 1), dtype=np.int64)
+        K = K[np.gcd(K, base) == 1]
+        result[K] = table.orders(K)
+    return result
+
+
+def period_table(base, limit, spf_path=None):
+    """
+    int64 array t with t[x] = period of the base-b expansion of 1/x, i.e.
+    ord_m(base) for m = x without the primes of base (0 when m = 1).
+    """
+    orders = order_table(base, limit, spf_path)
+    part = np.arange(limit + 1, dtype=np.int64)
+    for p in factorint(base):
+        hit = np.flatnonzero(part % p == 0)[1:]  # skip part[0] = 0
+        while hit.size:
+            part[hit] //= p
+            hit = hit[part[hit] % p == 0]
+    period = orders[part]
+    period[part <= 1] = 0
+    return period
+
+
+def carmichael_table(limit, spf_path=None):
+    """int64 array t with t[K] = lambda(K), the Carmichael function, for 0 <= K <= limit (t[0] = 0)."""
+    spf = spf_table(limit, spf_path)
+    result = np.zeros(limit + 1, dtype=np.int64)
+    result[1:] = 1
+    for lo in range(2, limit + 1, _CHUNK):
+        K = np.arange(lo, min(lo + _CHUNK, limit + 1), dtype=np.int64)
+        row, p, e = factor_many(K, spf)
+        # lambda(p^e) = phi(p^e), except 2^(e-2) for 2^e with e >= 3
+        lam = (p - 1) * p ** (e - 1)
+        lam = np.where((p == 2) & (e >= 3), lam // 2, lam)
+        firsts = np.flatnonzero(np.diff(row, prepend=-1))
+        result[K[row[firsts]]] = np.lcm.reduceat(lam, firsts)
+    return result
@@ -0,0 +1,112 @@
+"""
+Sieving the values of a polynomial f(k) = a k^2 + b k + c over a range of k.
+
+For every prime p the roots of f modulo p are found once (quadratic formula
+with a Tonelli-Shanks square root), and p is divided out of the whole
+arithmetic progressions k = r, r + p, r + 2p, ... of the value array at
+once.  After all primes up to sqrt(max f) are removed, whatever is left of
+each value is 1 or a single prime, so largest prime factors come out of a
+few vectorised passes instead of one factorisation per k.
+"""
+from math import isqrt
+
+import numpy as np
+
+from pe_sieve import iter_primes
+
+
+def sqrt_mod(a, p):
+    """A square root of a modulo the odd prime p (Tonelli-Shanks), or None."""
+    a %= p
+    if a == 0:
+        return 0
+    if pow(a, (p - 1) // 2, p) != 1:
+        return None
+    if p % 4 == 3:
+        return pow(a, (p + 1) // 4, p)
+    q, s = p - 1, 0
+    while q % 2 == 0:
+        q //= 2
+        s += 1
+    z = 2
+    while pow(z, (p - 1) // 2, p) != p - 1:
+        z += 1
+    m, c, t, r = s, pow(z, q, p), pow(a, q, p), pow(a, (q + 1) // 2, p)
+    while t != 1:
+        i, t2 = 0, t
+        while t2 != 1:
+            t2 = t2 * t2 % p
+            i += 1
+        b = pow(c, 1 << (m - i - 1), p)
+        m, c, t, r = i, b * b % p, t * b * b % p, r * b % p
+    return r
+
+
+def polynomial_roots(coeffs, p):
+    """Distinct roots modulo the prime p of c0 + c1 x + c2 x^2 (degree <= 2)."""
+    if len(coeffs) > 3:
+        raise ValueError("only polynomials of degree <= 2 are supported")
+    c = [x % p for x in coeffs] + [0] * (3 - len(coeffs))
+    if not any(c):
+        return list(range(p))
+    if p == 2:
+        return [x for x in (0, 1) if (c[0] + c[1] * x + c[2] * x) % 2 == 0]
+    if c[2] == 0:
+        if c[1] == 0:
+            return []
+        return [-c[0] * pow(c[1], -1, p) % p]
+    disc = (c[1] * c[1] - 4 * c[2] * c[0]) % p
+    root = sqrt_mod(disc, p)
+    if root is None:
+        return []
+    inverse = pow(2 * c[2], -1, p)
+    return sorted({(-c[1] + root) * inverse % p, (-c[1] - root) * inverse % p})
+
+
+def polynomial_values(coeffs, start, stop):
+    """int64 array of f(k) for start <= k < stop."""
+    if max(abs(polynomial_value(coeffs, start)), abs(polynomial_value(coeffs, stop - 1))) >= 1 << 62:
+        raise ValueError("values do not fit in int64")
+    k = np.arange(start, stop, dtype=np.int64)
+    values = np.zeros(k.size, dtype=np.int64)
+    for c in reversed(coeffs):
+        values = values * k + c
+    return values
+
+
+def polynomial_value(coeffs, k):
+    return sum(c * k ** i for i, c in enumerate(coeffs))
+
+
+def sieve_polynomial(coeffs, start, stop, prime_limit=None):
+    """
+    Divide every prime p <= prime_limit out of f(k), start <= k < stop.
+
+    Returns (residual, largest): what is left of each |f(k)| and the largest
+    prime removed from it (1 if none).  prime_limit defaults to sqrt(max f),
+    which leaves every residual 1 or prime.
+    """
+    residual = np.abs(polynomial_values(coeffs, start, stop))
+    largest = np.ones(residual.size, dtype=np.int64)
+    if prime_limit is None:
+        prime_limit = isqrt(int(residual.max(initial=0)))
+    for p in iter_primes(prime_limit):
+        for r in polynomial_roots(coeffs, p):
+            # First k >= start with k = r (mod p), as an offset into the arrays
+            first = (r - start) % p
+            hit = np.arange(first, residual.size, p)
+            if hit.size == 0:
+                continue
+            # f(k) = 0 exactly leaves a zero residual; nothing to divide there
+            hit = hit[residual[hit] != 0]
+            largest[hit] = p
+            while hit.size:
+                residual[hit] //= p
+                hit = hit[residual[hit] % p == 0]
+    return residual, largest
+
+
+def largest_prime_factors(coeffs, start, stop):
+    """Largest prime factor of |f(k)| for start <= k < stop (1 for |f(k)| = 1)."""
+    residual, largest = sieve_polynomial(coeffs, start, stop)
+    return np.maximum(residual, largest)
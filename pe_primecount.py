@@ -0,0 +1,157 @@
+"""
+Prime counts and prime power sums without listing the primes.
+
+Lucy_Hedgehog's dynamic programme keeps S(v) = sum of k^power over
+2 <= k <= v that survive sieving by the primes processed so far, for every
+v = N // k.  Those O(sqrt N) values are stored as two int64 arrays,
+small[v] for v <= sqrt N and large[k] for v = N // k, and sieving by p is
+
+    S(v) -= p^power * (S(v // p) - S(p - 1))    for v >= p^2,
+
+which becomes one strided slice, one gather and one np.repeat per prime,
+so the whole table costs O(N^{3/4} / log N) element operations.
+
+The arithmetic is int64 modulo m < 2^31, or modulo 2^64 (plain wraparound)
+without a modulus.  When a sum can exceed int64 the 2^64 pass is combined
+with passes modulo primes just below 2^31 by the Chinese remainder theorem.
+
+A Meissel-Lehmer split pi(x) = phi(x, a) + a - 1 - P2(x, a) does not save
+work here: phi(x, pi(x^{1/3})) is the same sieve restricted to the small
+primes, which is where Lucy's table spends its time, so prime_pi runs the
+table directly (about 20 s for N = 10^13).
+"""
+from math import isqrt
+
+import numpy as np
+
+from pe_blocksum import power_prefix_sum
+from pe_sieve import primes_up_to
+
+_INT64_MOD_LIMIT = 1 << 31
+_WRAP = 1 << 64
+# N // d is computed in float64 while the quotient is provably exact
+_FLOAT_DIVISION_LIMIT = 1 << 52
+
+
+def _crt_moduli(count):
+    """The count largest primes below 2^31."""
+    found = []
+    candidate = _INT64_MOD_LIMIT - 1
+    while len(found) < count:
+        if all(candidate % d for d in range(3, isqrt(candidate) + 1, 2)):
+            found.append(candidate)
+        candidate -= 2
+    return found
+
+
+def _lucy(N, power, mod):
+    """(small, large) int64 tables of sum_{p <= v} p^power, mod m or 2^64."""
+    r = isqrt(N)
+    reduce = (lambda a: a) if mod is None else (lambda a: a % mod)
+    small = reduce(power_prefix_sum(np.arange(r + 1), power, mod) - 1)
+    small[0] = 0
+    large = np.zeros(r + 1, dtype=np.int64)
+    large[1:] = reduce(power_prefix_sum(N // np.arange(1, r + 1, dtype=np.int64), power, mod) - 1)
+    k_float = np.arange(r + 1, dtype=np.float64)
+    for p in primes_up_to(r).tolist():
+        p2 = p * p
+        weight = pow(p, power, mod or _WRAP)
+        if weight >= 1 << 63:
+            weight -= _WRAP
+        base = small[p - 1]
+
+        def update(target, source):
+            delta = reduce(source - base)
+            target -= delta if weight == 1 else reduce(weight * delta)
+            if mod is not None:
+                target %= mod
+
+        # large[k] for N // k >= p^2; N // (kp) is large[kp] while kp <= r
+        k_max = min(r, N // p2)
+        k_strided = min(k_max, r // p)
+        update(large[1:k_strided + 1], large[p:k_strided * p + 1:p])
+        if k_max > k_strided:
+            if N < _FLOAT_DIVISION_LIMIT:
+                quotient = (float(N) / (k_float[k_strided + 1:k_max + 1] * p)).astype(np.int64)
+            else:
+                quotient = N // (np.arange(k_strided + 1, k_max + 1, dtype=np.int64) * p)
+            update(large[k_strided + 1:k_max + 1], small[quotient])
+        # small[v] for p^2 <= v <= r; v // p runs over p, ..., r // p, p times each
+        if p2 <= r:
+            update(small[p2:], np.repeat(small[p:r // p + 1], p)[:r - p2 + 1])
+    return small, large
+
+
+class PrimeSumTable:
+    """
+    S(v) = sum_{p <= v} p^power for every v of the form N // k.
+
+    Values are Python ints (reduced when mod is given); small and large
+    hold the int64 or object arrays described in the module docstring.
+    """
+
+    def __init__(self, N, power=0, mod=None):
+        self.N, self.power, self.mod = N, power, mod
+        self.root = isqrt(N)
+        if mod is not None and mod < _INT64_MOD_LIMIT:
+            self.small, self.large = _lucy(N, power, mod)
+            return
+        # Exact residues: 2^64 first, then primes below 2^31 until the product
+        # exceeds the largest possible sum, N^(power + 1)
+        bound = N ** (power + 1)
+        extra = 0
+        while _WRAP // 2 * (_INT64_MOD_LIMIT >> 1) ** extra <= bound:
+            extra += 1
+        small, large = _lucy(N, power, None)
+        if extra == 0:
+            self.small, self.large = small, large
+        else:
+            small, large = small.astype(np.uint64).astype(object), large.astype(np.uint64).astype(object)
+            modulus = _WRAP
+            for m in _crt_moduli(extra):
+                small_m, large_m = _lucy(N, power, m)
+                step = pow(modulus, -1, m)
+                small = small + modulus * ((small_m - small) % m * step % m)
+                large = large + modulus * ((large_m - large) % m * step % m)
+                modulus *= m
+            self.small, self.large = small, large
+        if mod is not None:
+            self.small, self.large = self.small % mod, self.large % mod
+
+    def __call__(self, v):
+        """S(v); v must be N // k for some k."""
+        if v <= self.root:
+            return int(self.small[v])
+        k = self.N // v
+        if self.N // k != v:
+            raise ValueError(f"{v} is not of the form {self.N} // k")
+        return int(self.large[k])
+
+    def range(self, lo, hi):
+        """sum of p^power over lo <= p <= hi (lo - 1 and hi of the form N // k)."""
+        total = self(hi) - self(lo - 1) if lo > 1 else self(hi)
+        return total % self.mod if self.mod is not None else total
+
+
+def prime_sum(N, power=1, mod=None):
+    """sum_{p <= N} p^power, reduced modulo mod when given."""
+    if N < 2:
+        return 0
+    return PrimeSumTable(N, power, mod)(N)
+
+
+def prime_pi(N):
+    """Number of primes <= N."""
+    return prime_sum(N, power=0)
+
+
+if __name__ == "__main__":
+    from sympy import primerange
+
+    # Exact power sums past the int64 range of the power-sum tables (power >= 6)
+    for power in (0, 1, 6, 7):
+        for N in (10, 1000, 10**5):
+            expected = sum(p ** power for p in primerange(2, N + 1))
+            assert prime_sum(N, power) == expected, (N, power)
+            assert prime_sum(N, power, 10**9 + 7) == expected % (10**9 + 7), (N, power)
+    print(prime_pi(10**10))
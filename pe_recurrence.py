@@ -0,0 +1,160 @@
+"""
+Linear recurrences modulo m for huge indices (Kitamasa's method).
+
+For a_n = c_1 a_{n-1} + ... + c_k a_{n-k} the n-th term is sum r_j a_j where
+r(x) = x^n mod P(x) and P(x) = x^k - c_1 x^{k-1} - ... - c_k.  x^n is built by
+square-and-multiply on polynomials, with the reduction mod P done as two
+multiplications by a precomputed power-series inverse, so each step costs a
+few length-k convolutions: O(k^2 log n) instead of O(k^3 log n) for the
+companion matrix.
+
+When only terms are known, berlekamp_massey recovers the coefficients
+(mod must then be prime).
+"""
+import numpy as np
+
+from pe_matrix import shift_mod
+
+_INT64_BITS = 63
+_INT64_MOD_LIMIT = 1 << 62
+
+
+def poly_mul_mod(a, b, mod):
+    """Product of two int64 coefficient arrays (entries in [0, mod)) modulo mod."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if mod >= _INT64_MOD_LIMIT:
+        prod = np.convolve(np.asarray(a, dtype=object), np.asarray(b, dtype=object))
+        return prod % mod
+    terms = min(len(a), len(b))
+    if terms * (mod - 1) ** 2 < (1 << _INT64_BITS):
+        return np.convolve(a, b) % mod
+
+    # terms products of two w-bit limbs must sum to less than 2^63
+    w = (_INT64_BITS - terms.bit_length()) // 2
+    limbs = -(-mod.bit_length() // w)
+    mask = (1 << w) - 1
+    a_limbs = [(a >> (w * i)) & mask for i in range(limbs)]
+    b_limbs = [(b >> (w * i)) & mask for i in range(limbs)]
+
+    partial = [0] * (2 * limbs - 1)
+    for i, ai in enumerate(a_limbs):
+        for j, bj in enumerate(b_limbs):
+            partial[i + j] = (partial[i + j] + np.convolve(ai, bj) % mod) % mod
+
+    c = partial[-1]
+    for p in reversed(partial[:-1]):
+        c = (shift_mod(c, w, mod) + p) % mod
+    return c
+
+
+def _series_inverse(f, length, mod):
+    """g with f * g == 1 (mod x^length); f[0] must be 1."""
+    g = np.ones(1, dtype=f.dtype)
+    t = 1
+    while t < length:
+        t = min(2 * t, length)
+        fg = poly_mul_mod(f[:t], g, mod)[:t]
+        correction = (-fg) % mod
+        correction[0] = (correction[0] + 2) % mod
+        g = poly_mul_mod(g, correction, mod)[:t]
+    return g
+
+
+class _PolyModulus:
+    """Reduction modulo the monic characteristic polynomial of a recurrence."""
+
+    def __init__(self, coeffs, mod):
+        self.k = len(coeffs)
+        self.mod = mod
+        dtype = object if mod >= _INT64_MOD_LIMIT else np.int64
+        c = np.array([x % mod for x in coeffs], dtype=dtype)
+        # P(x) low to high: -c_k, ..., -c_1, 1
+        self.poly = np.concatenate(((-c[::-1]) % mod, np.ones(1, dtype=dtype)))
+        # x^k == c_1 x^{k-1} + ... + c_k, low to high
+        self.tail = c[::-1].copy()
+        rev = self.poly[::-1].copy()
+        self.rev_inv = _series_inverse(rev, max(self.k - 1, 1), mod)
+
+    def reduce(self, a):
+        """a mod P for deg a <= 2k - 2."""
+        k, mod = self.k, self.mod
+        if len(a) <= k:
+            return a
+        qlen = len(a) - k
+        q = poly_mul_mod(a[::-1][:qlen], self.rev_inv[:qlen], mod)[:qlen][::-1]
+        qp = poly_mul_mod(q, self.poly, mod)[:k]
+        return (a[:k] - qp) % mod
+
+    def times_x(self, r):
+        """r * x mod P for deg r < k."""
+        shifted = np.concatenate((np.zeros(1, dtype=r.dtype), r))
+        top = shifted[self.k:self.k + 1]
+        return (shifted[:self.k] + poly_mul_mod(top, self.tail, self.mod)) % self.mod
+
+    def pow_x(self, n):
+        """x^n mod P."""
+        r = np.zeros(self.k, dtype=self.tail.dtype)
+        r[0] = 1 % self.mod
+        for bit in bin(n)[2:]:
+            r = self.reduce(poly_mul_mod(r, r, self.mod))
+            if bit == "1":
+                r = self.times_x(r)
+        return r
+
+
+def linear_recurrence_nth(coeffs, initial, n, mod):
+    """
+    a_n mod mod for a_i = coeffs[0] * a_{i-1} + ... + coeffs[k-1] * a_{i-k}.
+
+    initial holds a_0, ..., a_{k-1}.
+    """
+    k = len(coeffs)
+    if len(initial) < k:
+        raise ValueError(f"need {k} initial terms, got {len(initial)}")
+    if n < len(initial):
+        return initial[n] % mod
+    if k == 0:
+        return 0
+    r = _PolyModulus(coeffs, mod).pow_x(n)
+    return sum(int(x) * (y % mod) for x, y in zip(r.tolist(), initial)) % mod
+
+
+def berlekamp_massey(sequence, mod):
+    """
+    Shortest coeffs with a_i = sum coeffs[j] * a_{i-1-j} (mod prime mod).
+
+    Needs at least twice the recurrence order in terms to be trustworthy.
+    """
+    s = [x % mod for x in sequence]
+    current, previous = [], []
+    last_fail, last_delta = -1, 1
+    for i, term in enumerate(s):
+        delta = (term - sum(c * s[i - 1 - j] for j, c in enumerate(current))) % mod
+        if delta == 0:
+            continue
+        if last_fail < 0:
+            current = [0] * (i + 1)
+            last_fail, last_delta = i, delta
+            continue
+        scale = delta * pow(last_delta, -1, mod) % mod
+        candidate = [0] * (i - last_fail - 1) + [scale] + [(-scale * c) % mod for c in previous]
+        if len(candidate) < len(current):
+            candidate += [0] * (len(current) - len(candidate))
+        for j, c in enumerate(current):
+            candidate[j] = (candidate[j] + c) % mod
+        if i - last_fail + len(previous) >= len(current):
+            previous, last_fail, last_delta = current, i, delta
+        current = candidate
+    return current
+
+
+def guess_nth_term(sequence, n, mod):
+    """Infer the recurrence behind sequence with Berlekamp-Massey and evaluate a_n."""
+    coeffs = berlekamp_massey(sequence, mod)
+    return linear_recurrence_nth(coeffs, sequence[:len(coeffs)], n, mod)
+
+
+if __name__ == "__main__":
+    print(linear_recurrence_nth([1, 1], [0, 1], 10**18, 10**9 + 7))
+    print(berlekamp_massey([0, 1, 1, 2, 3, 5, 8, 13], 10**9 + 7))
@@ -0,0 +1,114 @@
+"""
+Segmented prime sieve shared by the Python solutions.
+
+Only odd numbers are stored (one byte each) and every segment is pre-filled
+from a tiled pattern that already has the multiples of 3, 5, 7, 11 and 13
+struck out, so the inner loop only has to handle primes >= 17.  Memory is
+bounded by the segment size no matter how large the limit is.
+"""
+from math import isqrt
+
+import numpy as np
+
+DEFAULT_SEGMENT = 1 << 18
+
+_WHEEL_PRIMES = (3, 5, 7, 11, 13)
+_WHEEL_PERIOD = 3 * 5 * 7 * 11 * 13  # period of the pattern over odd slots
+
+
+def _wheel_pattern():
+    """Odd slot j stands for 2*j + 1; zero out multiples of the wheel primes."""
+    pattern = np.ones(_WHEEL_PERIOD, dtype=np.uint8)
+    for p in _WHEEL_PRIMES:
+        # 2*j + 1 == 0 (mod p)  <=>  j == (p - 1) / 2 (mod p)
+        pattern[(p - 1) // 2::p] = 0
+    return pattern
+
+
+_PATTERN = _wheel_pattern()
+
+
+def _base_primes(limit):
+    """Plain odd-only sieve for the (small) sieving primes up to limit."""
+    if limit < 2:
+        return np.zeros(0, dtype=np.int64)
+    flags = np.ones((limit + 1) // 2, dtype=bool)
+    flags[0] = False
+    for i in range(1, (isqrt(limit) - 1) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 1
+            flags[p * p // 2::p] = False
+    odd = 2 * np.nonzero(flags)[0] + 1
+    return np.concatenate(([2], odd)).astype(np.int64)
+
+
+def iter_prime_blocks(limit, start=0, segment_size=DEFAULT_SEGMENT):
+    """
+    Yield the primes in [start, limit] as a sequence of sorted int64 arrays.
+
+    segment_size is the number of odd numbers covered per block, so each
+    block costs segment_size bytes regardless of limit.
+    """
+    if limit < 2 or start > limit:
+        return
+    if start <= 2:
+        yield np.array([2], dtype=np.int64)
+        start = 3
+    base = _base_primes(isqrt(limit))
+    base = base[base > _WHEEL_PRIMES[-1]]
+    tiled = np.tile(_PATTERN, segment_size // _WHEEL_PERIOD + 2)
+
+    lo = start | 1
+    while lo <= limit:
+        hi = min(lo + 2 * segment_size, limit + 1)
+        size = (hi - lo + 1) // 2
+        offset = (lo // 2) % _WHEEL_PERIOD
+        seg = tiled[offset:offset + size].copy()
+
+        for p in base:
+            p = int(p)
+            first = p * p
+            if first >= hi:
+                break
+            if first < lo:
+                first = -(-lo // p) * p
+                if first % 2 == 0:
+                    first += p
+            seg[(first - lo) // 2::p] = 0
+
+        if lo <= _WHEEL_PRIMES[-1]:
+            for p in _WHEEL_PRIMES:
+                if lo <= p < hi:
+                    seg[(p - lo) // 2] = 1
+
+        block = lo + 2 * np.nonzero(seg)[0].astype(np.int64)
+        if block.size:
+            yield block
+        lo = hi if hi % 2 else hi + 1
+
+
+def iter_primes(limit, start=0, segment_size=DEFAULT_SEGMENT):
+    """Stream the primes in [start, limit] one at a time as Python ints."""
+    for block in iter_prime_blocks(limit, start, segment_size):
+        yield from block.tolist()
+
+
+def primes_up_to(limit, start=0):
+    """All primes in [start, limit] as a single int64 array."""
+    blocks = list(iter_prime_blocks(limit, start))
+    if not blocks:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(blocks)
+
+
+def prime_mask(limit):
+    """Boolean array of length limit + 1 with mask[n] set iff n is prime."""
+    mask = np.zeros(limit + 1, dtype=bool)
+    for block in iter_prime_blocks(limit):
+        mask[block] = True
+    return mask
+
+
+if __name__ == "__main__":
+    print(primes_up_to(100).tolist())
+    print(sum(block.size for block in iter_prime_blocks(10**8)))
@@ -0,0 +1,111 @@
+"""
+Smallest-prime-factor table and bulk factorisation shared by the Python solutions.
+
+spf[n] is the smallest prime dividing n (spf[0] = 0, spf[1] = 1), stored as
+uint32 so a table up to 10^8 takes 400 MB.  It is built by the linear sieve:
+every composite n is written exactly once, as p * i with p = spf(n), which
+is the case exactly when every prime factor of i is >= p.  Processing the
+primes in increasing order, those i are exactly the entries still unset
+when p comes up, so each prime needs one vectorised pass.
+
+A table can be saved to an .npy file and reopened memory-mapped, so later
+runs pay only for the pages they touch.
+"""
+import os
+from math import isqrt
+
+import numpy as np
+
+
+def _build(limit):
+    spf = np.zeros(limit + 1, dtype=np.uint32)
+    if limit >= 1:
+        spf[1] = 1
+    for p in range(2, isqrt(limit) + 1):
+        if spf[p]:
+            continue
+        # i runs over p..limit//p with all prime factors >= p
+        i = np.arange(p, limit // p + 1)
+        i = i[spf[p:limit // p + 1] == 0]
+        spf[p * i] = p
+    primes = np.flatnonzero(spf == 0)
+    spf[primes[primes >= 2]] = primes[primes >= 2]
+    return spf
+
+
+def spf_table(limit, path=None):
+    """
+    uint32 smallest-prime-factor table for 0..limit.
+
+    With a path the table is loaded memory-mapped from that .npy file when it
+    already covers limit (a longer table is sliced), and built and saved there
+    otherwise.
+    """
+    if limit >= 1 << 32:
+        raise ValueError("uint32 table needs limit < 2^32")
+    if path is not None and os.path.exists(path):
+        spf = np.load(path, mmap_mode="r")
+        if len(spf) > limit:
+            return spf[:limit + 1]
+    spf = _build(limit)
+    if path is not None:
+        np.save(path, spf)
+        return np.load(path, mmap_mode="r")
+    return spf
+
+
+def factor_many(values, spf):
+    """
+    Factorise every entry of values (1 <= v < len(spf)) at once.
+
+    Returns int64 arrays (index, prime, exponent) sorted by index and then
+    prime, one row per distinct prime of values[index]; 1 has no rows.  Each
+    round divides every unfinished value by the full power of its smallest
+    prime factor.
+    """
+    n = np.asarray(values, dtype=np.int64).ravel()
+    if n.size and (n.min() < 1 or n.max() >= len(spf)):
+        raise ValueError("values must lie in 1..len(spf) - 1")
+    index = np.arange(n.size, dtype=np.int64)
+    rows, primes, exponents = [], [], []
+    while True:
+        live = n > 1
+        if not live.any():
+            break
+        n, index = n[live], index[live]
+        p = spf[n].astype(np.int64)
+        # Strip the whole power of p so every round yields distinct primes
+        n = n // p
+        e = np.ones(n.size, dtype=np.int64)
+        more = np.flatnonzero(n % p == 0)
+        while more.size:
+            n[more] //= p[more]
+            e[more] += 1
+            more = more[n[more] % p[more] == 0]
+        rows.append(index)
+        primes.append(p)
+        exponents.append(e)
+    if not rows:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty
+    # Each round is sorted by index and its primes exceed the previous
+    # round's, so a stable sort on index (merging the runs) finishes the job
+    rows = np.concatenate(rows)
+    order = np.argsort(rows, kind="stable")
+    return rows[order], np.concatenate(primes)[order], np.concatenate(exponents)[order]
+
+
+def factorize(n, spf):
+    """{prime: exponent} for a single 1 <= n < len(spf) by table lookups."""
+    factors = {}
+    while n > 1:
+        p = int(spf[n])
+        factors[p] = factors.get(p, 0) + 1
+        n //= p
+    return factors
+
+
+if __name__ == "__main__":
+    table = spf_table(100)
+    print(factorize(84, table))
+    print(factor_many([12, 1, 97, 100], table))
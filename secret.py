@@ -1,67 +1,95 @@
 import numpy as np
 from collections import defaultdict
 
-def matrix_to_str(matrix):
-    """Convert matrix to string representation for hash-based cycle detection"""
-    return str(matrix.tolist())
+from pe_matrix import mat_pow_vec_mod
+
+MOD = 7
+
+def matrix_key(matrix):
+    """Compact hashable key of a reduced uint8 state"""
+    return matrix.tobytes()
 
 def transform_matrix(matrix):
     """Transform matrix by replacing each cell with the sum of its four orthogonal neighbors"""
-    rows, cols = matrix.shape
-    new_matrix = np.zeros((rows, cols), dtype=object)
-    
-    for i in range(rows):
-        for j in range(cols):
-            # Get the four orthogonal neighbors with wrap-around
-            top = matrix[(i - 1) % rows, j]
-            bottom = matrix[(i + 1) % rows, j]
-            left = matrix[i, (j - 1) % cols]
-            right = matrix[i, (j + 1) % cols]
-            
-            # Sum the neighbors
-            new_matrix[i, j] = (top + bottom + left + right)%7
+    # Neighbours with wrap-around; 4 * 6 fits comfortably in uint8
+    total = (np.roll(matrix, 1, axis=0) + np.roll(matrix, -1, axis=0)
+             + np.roll(matrix, 1, axis=1) + np.roll(matrix, -1, axis=1))
+    return total % MOD
+
+def brent_cycle(initial, step, max_steps=None):
+    """
+    Brent's cycle detection on the orbit of initial under step.
+
+    Only two states are held at a time.  Returns (cycle_start, cycle_length),
+    or None when no cycle has closed within max_steps transforms.
+    """
+    power = cycle_length = 1
+    tortoise = initial
+    hare = step(initial)
+    steps = 1
+    while matrix_key(tortoise) != matrix_key(hare):
+        if power == cycle_length:
+            tortoise = hare
+            power *= 2
+            cycle_length = 0
+        hare = step(hare)
+        cycle_length += 1
+        steps += 1
+        if max_steps is not None and steps > max_steps:
+            return None
     
-    return new_matrix
+    # Walk a tortoise from the start and a hare one cycle ahead until they meet
+    tortoise = hare = initial
+    for _ in range(cycle_length):
+        hare = step(hare)
+    cycle_start = 0
+    while matrix_key(tortoise) != matrix_key(hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        cycle_start += 1
+    return cycle_start, cycle_length
 
-def detect_cycle_and_transform(initial_matrix, target_iterations=10**12):
-    """Detect cycle in matrix transformations and calculate final state"""
-    # Convert input to numpy array with object dtype for arbitrary-precision integers
-    matrix = np.array(initial_matrix, dtype=object)
+def transform_operator(shape):
+    """The transform as a matrix over GF(7) acting on the flattened grid"""
+    size = shape[0] * shape[1]
+    operator = np.zeros((size, size), dtype=np.int64)
+    for cell in range(size):
+        basis = np.zeros(size, dtype=np.uint8)
+        basis[cell] = 1
+        operator[:, cell] = transform_matrix(basis.reshape(shape)).ravel()
+    return operator
+
+def transform_linear(matrix, iterations):
+    """Apply the transform iterations times by exponentiating its GF(7) matrix"""
+    operator = transform_operator(matrix.shape)
+    state = mat_pow_vec_mod(operator, iterations, matrix.ravel().astype(np.int64), MOD)
+    return state.reshape(matrix.shape).astype(np.uint8)
+
+def detect_cycle_and_transform(initial_matrix, target_iterations=10**12, max_cycle_steps=10**6):
+    """
+    Calculate the state after target_iterations transforms.
+
+    The orbit is searched for a cycle with Brent's algorithm; if none closes
+    within max_cycle_steps transforms, the transform is treated as a linear
+    map over GF(7) and raised to the target power directly.
+    """
+    # The transform only ever sees values mod 7
+    matrix = np.mod(np.array(initial_matrix, dtype=np.int64), MOD).astype(np.uint8)
+    
+    cycle = brent_cycle(matrix, transform_matrix, max_cycle_steps)
+    if cycle is None:
+        print(f"No cycle within {max_cycle_steps} iterations, exponentiating the linear map")
+        return transform_linear(matrix, target_iterations)
     
-    # Dictionary to store matrices we've seen and at which iteration
-    seen_matrices = {}
+    cycle_start, cycle_length = cycle
+    print(f"Cycle detected! Starts at iteration {cycle_start}, length {cycle_length}")
     
-    iterations = 0
-    while iterations < target_iterations:
-        # Create a hashable representation of the current matrix
-        matrix_str = matrix_to_str(matrix)
-        
-        # Check if we've seen this matrix state before
-        if matrix_str in seen_matrices:
-            # We found a cycle!
-            cycle_start = seen_matrices[matrix_str]
-            cycle_length = iterations - cycle_start
-            print(f"Cycle detected! Starts at iteration {cycle_start}, length {cycle_length}")
-            
-            # Calculate remaining iterations needed after cycles
-            remaining_iterations = (target_iterations - iterations) % cycle_length
-            
-            # Apply the remaining iterations
-            for _ in range(remaining_iterations):
-                matrix = transform_matrix(matrix)
-            
-            return matrix
-        
-        # Store current matrix state
-        seen_matrices[matrix_str] = iterations
-        
-        # Transform matrix
+    # Iterations needed from the start to land on the same state as the target
+    iterations = target_iterations
+    if target_iterations > cycle_start:
+        iterations = cycle_start + (target_iterations - cycle_start) % cycle_length
+    for _ in range(iterations):
         matrix = transform_matrix(matrix)
-        iterations += 1
-        
-        # Print progress every 100 iterations
-        if iterations % 100 == 0:
-            print(f"Completed {iterations} iterations...")
     
     return matrix
 
@@ -0,0 +1,121 @@
+"""
+Terms of the sequence a_1 = 1, a_{2n} = 2 a_n, a_{2n+1} = a_n - 3 a_{n+1}.
+
+A single a_n is found by walking the binary digits of n from the top while
+carrying the pair (a_k, a_{k+1}) for the prefix k read so far, so it takes
+O(log n) steps and no memo.  a_table fills a whole prefix a_1..a_N bottom-up,
+one binary level at a time.
+
+The prefix sums S(n) = a_1 + ... + a_n telescope to
+
+    S(2k) = 4 - a_k,    S(2k + 1) = 4 - 3 a_{k+1},
+
+so S(n) is a linear read-out of the same pair walked for k = n // 2; with
+a_0 = 4 (the value the odd rule implies for a_1) this holds from n = 0.
+prefix_sums runs that walk for a whole array of n at once.
+"""
+import numpy as np
+
+# |a_n| < 4^bit_length(n), so int64 is exact up to this many bits
+_INT64_BITS = 31
+_INT64_LIMIT = 1 << 63
+
+
+def a_pair(n):
+    """(a_n, a_{n+1}) for n >= 0, taking a_0 = 4."""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if n == 0:
+        return 4, 1
+    a_k, a_k1 = 1, 2  # k = 1
+    for bit in bin(n)[3:]:
+        if bit == "0":  # k -> 2k
+            a_k, a_k1 = 2 * a_k, a_k - 3 * a_k1
+        else:  # k -> 2k + 1
+            a_k, a_k1 = a_k - 3 * a_k1, 2 * a_k1
+    return a_k, a_k1
+
+
+def a_n(n):
+    """a_n for n >= 1."""
+    return a_pair(n)[0]
+
+
+def a_table(N):
+    """
+    Array a with a[n] = a_n for 1 <= n <= N (a[0] is 0).
+
+    int64 while every term fits, object otherwise.  Level j fills indices
+    [2^j, 2^{j+1}) from the level below; evens first, since the odd terms of
+    a level need a_{2^j}.
+    """
+    dtype = np.int64 if N.bit_length() <= _INT64_BITS else object
+    a = np.zeros(N + 1, dtype=dtype)
+    if N < 1:
+        return a
+    a[1] = 1
+    lo = 1
+    while 2 * lo <= N:
+        k = np.arange(lo, min(2 * lo, N // 2 + 1))
+        a[2 * k] = 2 * a[k]
+        k = np.arange(lo, min(2 * lo, (N - 1) // 2 + 1))
+        a[2 * k + 1] = a[k] - 3 * a[k + 1]
+        lo *= 2
+    return a
+
+
+def prefix_sum(n):
+    """S(n) = a_1 + ... + a_n from one binary walk over n // 2."""
+    a_k, a_k1 = a_pair(n // 2)
+    return 4 - a_k if n % 2 == 0 else 4 - 3 * a_k1
+
+
+def _pairs_many(k):
+    """
+    Vectorised a_pair over an int64 array k, all walks advancing together.
+
+    Walks shorter than the longest one idle once their bits run out.  The
+    pair stays int64 until the next step could overflow (each step at most
+    quadruples the largest magnitude), then continues as object.
+    """
+    lengths = np.zeros(k.shape, dtype=np.int64)
+    rest = k.copy()
+    while rest.any():
+        lengths += rest > 0
+        rest >>= 1
+    a_k = np.where(k == 0, 4, 1).astype(np.int64)
+    a_k1 = np.where(k == 0, 1, 2).astype(np.int64)
+    for step in range(1, int(lengths.max(initial=0))):
+        if a_k.dtype != object:
+            largest = max(int(np.abs(a_k).max()), int(np.abs(a_k1).max()))
+            if 4 * largest >= _INT64_LIMIT:
+                a_k, a_k1 = a_k.astype(object), a_k1.astype(object)
+        active = lengths > step
+        shift = np.where(active, lengths - 1 - step, 0)
+        one = active & ((k >> shift) & 1).astype(bool)
+        zero = active & ~one
+        odd = a_k - 3 * a_k1
+        a_k, a_k1 = (np.where(one, odd, np.where(zero, 2 * a_k, a_k)),
+                     np.where(one, 2 * a_k1, np.where(zero, odd, a_k1)))
+    return a_k, a_k1
+
+
+def prefix_sums(ns, dense_factor=4):
+    """
+    S(n) for every n in the array ns (non-negative, below 2^63).
+
+    Dense query sets (max(ns) within dense_factor * len(ns)) share one
+    a_table; sparse ones run the binary walks side by side.  The result is
+    int64 when every walk stayed in range, object otherwise.
+    """
+    ns = np.asarray(ns, dtype=np.int64)
+    k = ns // 2
+    odd = ns % 2 == 1
+    top = int(k.max(initial=0))
+    if top + 2 <= dense_factor * max(ns.size, 1):
+        table = a_table(top + 1)
+        table[0] = 4
+        a_k, a_k1 = table[k], table[k + 1]
+    else:
+        a_k, a_k1 = _pairs_many(k)
+    return np.where(odd, 4 - 3 * a_k1, 4 - a_k)
@@ -5,6 +5,8 @@ from collections import defaultdict
 import time
 from typing import Dict, Set, Tuple, List, Optional
 
+from memory_game_states import StateTable, canonical_pair
+
 @dataclass(frozen=True)
 class SymbolicState:
     """Represents a symbolic state of the memory game."""
@@ -140,12 +142,94 @@ class SymbolicSolver:
         
         return next_state
     
+    def canonical_state(self, state: SymbolicState) -> SymbolicState:
+        """Relabel the symbols a, b, c, ... in order of first appearance."""
+        larry, robin = canonical_pair(state.larry_memory, state.robin_memory)
+        return SymbolicState(
+            larry_memory=tuple(self.symbols[x] for x in larry),
+            robin_memory=tuple(self.symbols[x] for x in robin),
+            score=state.score,
+            larry_serving=state.larry_serving
+        )
+    
+    def weighted_successors(self, state: SymbolicState) -> List[Tuple[SymbolicState, float]]:
+        """Next states after one call, with the probability of reaching each."""
+        successors = []
+        
+        # Special handling for L==R states (but not for empty memories)
+        if state.is_lr_equal and len(state.larry_memory) > 0:
+            # Use the canonical memory
+            memory = self.canonical_memory
+            memory_set = set(memory)
+            
+            # Case 1: Symbol in memory (both remember)
+            for symbol in memory:
+                # Probability = 1 / total_symbols for each symbol
+                successors.append((self.get_next_state(state, symbol), 1 / self.total_symbols))
+            
+            # Case 2: Symbol not in memory (neither remembers)
+            neither_count = self.total_symbols - len(memory_set)
+            if neither_count > 0:
+                # Use a representative symbol not in memory
+                available_symbols = set(self.symbols) - memory_set
+                if available_symbols:
+                    symbol = sorted(available_symbols)[0]
+                    # Probability = (number in neither memory) / total_symbols
+                    successors.append((self.get_next_state(state, symbol), neither_count / self.total_symbols))
+            return successors
+        
+        # Normal case (L!=R)
+        # Categorize symbols by their presence in memory
+        larry_memory_set = set(state.larry_memory)
+        robin_memory_set = set(state.robin_memory)
+        
+        # Find symbols in both memories
+        both_remember = larry_memory_set.intersection(robin_memory_set)
+        
+        # Find symbols only in Larry's memory
+        larry_only = larry_memory_set - robin_memory_set
+        
+        # Find symbols only in Robin's memory
+        robin_only = robin_memory_set - larry_memory_set
+        
+        # Calculate number of symbols in neither memory
+        total_remembered = len(both_remember) + len(larry_only) + len(robin_only)
+        neither_count = self.total_symbols - total_remembered
+        
+        # Case 1 and 2: Both players remember, or only Larry does
+        for symbol in both_remember | larry_only:
+            # Probability = 1 / total_symbols for each symbol
+            successors.append((self.get_next_state(state, symbol), 1 / self.total_symbols))
+        
+        # Case 3: Only Robin remembers
+        # Larry's new front differs per symbol, so these cannot share one
+        # representative; equivalent successors are merged by the state table
+        for symbol in robin_only:
+            successors.append((self.get_next_state(state, symbol), 1 / self.total_symbols))
+        
+        # Case 4: Neither remembers
+        if neither_count > 0:
+            # Use a representative new symbol (one that's not in either memory)
+            used_symbols = larry_memory_set.union(robin_memory_set)
+            available_symbols = set(self.symbols) - used_symbols
+            
+            if available_symbols:
+                # Use the first symbol alphabetically for deterministic behavior
+                symbol = sorted(available_symbols)[0]
+                # Probability = (number in neither memory) / total_symbols
+                successors.append((self.get_next_state(state, symbol), neither_count / self.total_symbols))
+        
+        return successors
+    
     def solve_dp(self, n_rounds: int) -> Tuple[float, Dict[SymbolicState, float]]:
-        """Solve using dynamic programming approach with single canonical L==R state."""
+        """Solve using dynamic programming approach with single canonical L==R state.
+        All other states are interned in relabelled canonical form as well."""
         print(f"Solving with dynamic programming for {n_rounds} rounds...")
         print(f"Using single canonical L==R state optimization")
         start_time = time.time()
         
+        table = StateTable(self.canonical_state, self.weighted_successors)
+        
         # Start with empty memories (special case, don't use canonical memory)
         initial_state = SymbolicState(
             larry_memory=(),  # Empty tuple
@@ -155,18 +239,19 @@ class SymbolicSolver:
         )
         
         # Dictionary to store probabilities of each state
-        # Key: state, Value: probability
-        prev_round = {initial_state: 1.0}
+        # Key: state id in the table, Value: probability
+        prev_round = {table.intern(initial_state): 1.0}
         
         # For each round
         for round_num in range(n_rounds):
             # Count L==R states
-            lr_equal_states = sum(1 for state in prev_round if state.is_lr_equal)
+            lr_equal_states = sum(1 for state_id in prev_round if table[state_id].is_lr_equal)
             print(f"Round {round_num}: {len(prev_round)} states ({lr_equal_states} L==R states)")
             
             # Print L==R states by score and serving status
             if lr_equal_states > 0:
-                lr_states = [(state.score, state.larry_serving) for state in prev_round if state.is_lr_equal]
+                lr_states = [(table[state_id].score, table[state_id].larry_serving)
+                             for state_id in prev_round if table[state_id].is_lr_equal]
                 lr_counts = defaultdict(int)
                 for score, serving in lr_states:
                     lr_counts[(score, serving)] += 1
@@ -182,7 +267,7 @@ class SymbolicSolver:
             processed_states = 0
             
             # For each state in previous round
-            for state, probability in prev_round.items():
+            for state_id, probability in prev_round.items():
                 # Skip low probability states
                 if probability < self.probability_threshold:
                     pruned_states += 1
@@ -190,109 +275,27 @@ class SymbolicSolver:
                 
                 processed_states += 1
                 
-                # Special handling for L==R states (but not for empty memories)
-                if state.is_lr_equal and len(state.larry_memory) > 0:
-                    # Use the canonical memory
-                    memory = self.canonical_memory
-                    memory_set = set(memory)
-                    
-                    # Case 1: Symbol in memory (both remember)
-                    for symbol in memory:
-                        next_state = self.get_next_state(state, symbol)
-                        # Probability = 1 / total_symbols for each symbol
-                        new_prob = probability * (1 / self.total_symbols)
-                        if new_prob >= self.probability_threshold:
-                            curr_round[next_state] += new_prob
-                    
-                    # Case 2: Symbol not in memory (neither remembers)
-                    neither_count = self.total_symbols - len(memory_set)
-                    if neither_count > 0:
-                        # Use a representative symbol not in memory
-                        available_symbols = set(self.symbols) - memory_set
-                        if available_symbols:
-                            symbol = sorted(available_symbols)[0]
-                            next_state = self.get_next_state(state, symbol)
-                            # Probability = (number in neither memory) / total_symbols
-                            new_prob = probability * (neither_count / self.total_symbols)
-                            if new_prob >= self.probability_threshold:
-                                curr_round[next_state] += new_prob
-                else:
-                    # Normal case (L!=R)
-                    # Categorize symbols by their presence in memory
-                    larry_memory_set = set(state.larry_memory)
-                    robin_memory_set = set(state.robin_memory)
-                    
-                    # Find symbols in both memories
-                    both_remember = larry_memory_set.intersection(robin_memory_set)
-                    
-                    # Find symbols only in Larry's memory
-                    larry_only = larry_memory_set - robin_memory_set
-                    
-                    # Find symbols only in Robin's memory
-                    robin_only = robin_memory_set - larry_memory_set
-                    
-                    # Calculate number of symbols in neither memory
-                    total_remembered = len(both_remember) + len(larry_only) + len(robin_only)
-                    neither_count = self.total_symbols - total_remembered
-                    
-                    # Case 1: Both players remember
-                    if both_remember:
-                        for symbol in both_remember:
-                            next_state = self.get_next_state(state, symbol)
-                            # Probability = 1 / total_symbols for each symbol
-                            new_prob = probability * (1 / self.total_symbols)
-                            if new_prob >= self.probability_threshold:
-                                curr_round[next_state] += new_prob
-                    
-                    # Case 2: Only Larry remembers
-                    if larry_only:
-                        # Each symbol in larry_only leads to a different state, so process all
-                        for symbol in larry_only:
-                            next_state = self.get_next_state(state, symbol)
-                            # Probability = 1 / total_symbols for each symbol
-                            new_prob = probability * (1 / self.total_symbols)
-                            if new_prob >= self.probability_threshold:
-                                curr_round[next_state] += new_prob
-                    
-                    # Case 3: Only Robin remembers
-                    if robin_only:
-                        # Use the first symbol alphabetically for deterministic behavior
-                        symbol = sorted(robin_only)[0]
-                        next_state = self.get_next_state(state, symbol)
-                        # Probability = (number only in Robin's memory) / total_symbols
-                        new_prob = probability * (len(robin_only) / self.total_symbols)
-                        if new_prob >= self.probability_threshold:
-                            curr_round[next_state] += new_prob
-                    
-                    # Case 4: Neither remembers
-                    if neither_count > 0:
-                        # Use a representative new symbol (one that's not in either memory)
-                        used_symbols = larry_memory_set.union(robin_memory_set)
-                        available_symbols = set(self.symbols) - used_symbols
-                        
-                        if available_symbols:
-                            # Use the first symbol alphabetically for deterministic behavior
-                            symbol = sorted(available_symbols)[0]
-                            next_state = self.get_next_state(state, symbol)
-                            # Probability = (number in neither memory) / total_symbols
-                            new_prob = probability * (neither_count / self.total_symbols)
-                            if new_prob >= self.probability_threshold:
-                                curr_round[next_state] += new_prob
+                for next_id, weight in table.successors(state_id):
+                    new_prob = probability * weight
+                    if new_prob >= self.probability_threshold:
+                        curr_round[next_id] += new_prob
             
             # Count L==R states in next round
-            next_lr_equal_states = sum(1 for state in curr_round if state.is_lr_equal)
+            next_lr_equal_states = sum(1 for state_id in curr_round if table[state_id].is_lr_equal)
             print(f"  Processed {processed_states} states, pruned {pruned_states} low-probability states")
             print(f"  Next round L==R states: {next_lr_equal_states}")
             
             prev_round = curr_round
         
+        final_states = {table[state_id]: probability for state_id, probability in prev_round.items()}
+        
         # Calculate expected score
         expected_score = 0.0
-        for state, probability in prev_round.items():
+        for state, probability in final_states.items():
             expected_score += state.score * probability
         
         print(f"DP solution completed in {time.time() - start_time:.2f} seconds")
-        return expected_score, prev_round
+        return expected_score, final_states
     
     def print_state_statistics(self, states_dict):
         """Print statistics about the states."""
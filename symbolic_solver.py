@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 import numpy as np
+from scipy import sparse
 from dataclasses import dataclass
 from collections import defaultdict
 import time
 from typing import Dict, Set, Tuple, List, Optional
 
+from memory_game_states import StateTable, canonical_pair
+
 @dataclass(frozen=True)
 class SymbolicState:
     """Represents a symbolic state of the memory game."""
@@ -65,21 +68,18 @@ class SymbolicSolver:
             
             return tuple(memory_list)
 
-    def get_next_state(self, state: SymbolicState, symbol: str) -> SymbolicState:
-        """Compute the next state after a symbol is called."""
-        larry_remembers = symbol in state.larry_memory
-        robin_remembers = symbol in state.robin_memory
-        
-        # Calculate new score and serving status
-        new_score = state.score
-        new_larry_serving = state.larry_serving
+    def next_score(self, score: int, larry_serving: bool,
+                   larry_remembers: bool, robin_remembers: bool) -> Tuple[int, bool]:
+        """Score and serving status after a call, given who remembered the symbol."""
+        new_score = score
+        new_larry_serving = larry_serving
         
         if larry_remembers and robin_remembers:
             # Both remember - no score change
             pass
         elif larry_remembers:
             # Only Larry remembers
-            if state.larry_serving:
+            if larry_serving:
                 new_score += 1
             else:
                 new_score -= 1
@@ -87,7 +87,7 @@ class SymbolicSolver:
                     new_larry_serving = True
         elif robin_remembers:
             # Only Robin remembers
-            if not state.larry_serving:
+            if not larry_serving:
                 new_score += 1
             else:
                 new_score -= 1
@@ -95,6 +95,17 @@ class SymbolicSolver:
                     new_larry_serving = False
                     new_score = abs(new_score)  # Convert to positive
         
+        return new_score, new_larry_serving
+
+    def get_next_state(self, state: SymbolicState, symbol: str) -> SymbolicState:
+        """Compute the next state after a symbol is called."""
+        larry_remembers = symbol in state.larry_memory
+        robin_remembers = symbol in state.robin_memory
+        
+        # Calculate new score and serving status
+        new_score, new_larry_serving = self.next_score(
+            state.score, state.larry_serving, larry_remembers, robin_remembers)
+        
         # Update memories
         new_larry_memory = self.update_larry_memory(state.larry_memory, symbol)
         new_robin_memory = self.update_robin_memory(state.robin_memory, symbol)
@@ -106,12 +117,73 @@ class SymbolicSolver:
             larry_serving=new_larry_serving
         )
     
+    def canonical_state(self, state: SymbolicState) -> SymbolicState:
+        """Relabel the symbols a, b, c, ... in order of first appearance."""
+        larry, robin = canonical_pair(state.larry_memory, state.robin_memory)
+        return SymbolicState(
+            larry_memory=tuple(self.symbols[x] for x in larry),
+            robin_memory=tuple(self.symbols[x] for x in robin),
+            score=state.score,
+            larry_serving=state.larry_serving
+        )
+    
+    def weighted_successors(self, state: SymbolicState) -> List[Tuple[SymbolicState, float]]:
+        """Next states after one call, with the probability of reaching each."""
+        successors = []
+        
+        # Categorize symbols by their presence in memory
+        larry_memory_set = set(state.larry_memory)
+        robin_memory_set = set(state.robin_memory)
+        
+        # Find symbols in both memories
+        both_remember = larry_memory_set.intersection(robin_memory_set)
+        
+        # Find symbols only in Larry's memory
+        larry_only = larry_memory_set - robin_memory_set
+        
+        # Find symbols only in Robin's memory
+        robin_only = robin_memory_set - larry_memory_set
+        
+        # Calculate number of symbols in neither memory
+        total_remembered = len(both_remember) + len(larry_only) + len(robin_only)
+        neither_count = self.total_symbols - total_remembered
+        
+        # Case 1 and 2: Both players remember, or only Larry does
+        # (each symbol leads to a different state for Larry)
+        for symbol in both_remember | larry_only:
+            # Probability = 1 / total_symbols for each symbol
+            successors.append((self.get_next_state(state, symbol), 1 / self.total_symbols))
+        
+        # Case 3: Only Robin remembers
+        # Larry's new front differs per symbol, so these cannot share one
+        # representative; equivalent successors are merged by the state table
+        for symbol in robin_only:
+            successors.append((self.get_next_state(state, symbol), 1 / self.total_symbols))
+        
+        # Case 4: Neither remembers
+        if neither_count > 0:
+            # Use a representative new symbol (one that's not in either memory)
+            used_symbols = larry_memory_set.union(robin_memory_set)
+            available_symbols = set(self.symbols) - used_symbols
+            
+            if available_symbols:
+                # Use the first symbol alphabetically for deterministic behavior
+                symbol = sorted(available_symbols)[0]
+                # Probability = (number in neither memory) / total_symbols
+                successors.append((self.get_next_state(state, symbol), neither_count / self.total_symbols))
+        
+        return successors
+    
     def solve_dp(self, n_rounds: int) -> Tuple[float, Dict[SymbolicState, float]]:
         """Solve using dynamic programming approach - propagating probabilities forward.
+        States are interned in canonical (relabelled) form, so equivalent states
+        share one id and one cached successor list.
         Returns expected score and final state distribution."""
         print(f"Solving with dynamic programming for {n_rounds} rounds...")
         start_time = time.time()
         
+        table = StateTable(self.canonical_state, self.weighted_successors)
+        
         # Start with empty memories
         initial_state = SymbolicState(
             larry_memory=(),  # Empty tuple
@@ -121,8 +193,8 @@ class SymbolicSolver:
         )
         
         # Dictionary to store probabilities of each state
-        # Key: state, Value: probability
-        prev_round = {initial_state: 1.0}
+        # Key: state id in the table, Value: probability
+        prev_round = {table.intern(initial_state): 1.0}
         
         # For each round
         for round_num in range(n_rounds):
@@ -132,7 +204,7 @@ class SymbolicSolver:
             processed_states = 0
             
             # For each state in previous round
-            for state, probability in prev_round.items():
+            for state_id, probability in prev_round.items():
                 # Skip low probability states
                 if probability < self.probability_threshold:
                     pruned_states += 1
@@ -140,77 +212,37 @@ class SymbolicSolver:
                 
                 processed_states += 1
                 
-                # Categorize symbols by their presence in memory
-                larry_memory_set = set(state.larry_memory)
-                robin_memory_set = set(state.robin_memory)
-                
-                # Find symbols in both memories
-                both_remember = larry_memory_set.intersection(robin_memory_set)
-                
-                # Find symbols only in Larry's memory
-                larry_only = larry_memory_set - robin_memory_set
-                
-                # Find symbols only in Robin's memory
-                robin_only = robin_memory_set - larry_memory_set
-                
-                # Calculate number of symbols in neither memory
-                total_remembered = len(both_remember) + len(larry_only) + len(robin_only)
-                neither_count = self.total_symbols - total_remembered
-                
-                # Case 1: Both players remember (each symbol leads to a different state for Larry)
-                if both_remember:
-                    for symbol in both_remember:
-                        next_state = self.get_next_state(state, symbol)
-                        # Probability = 1 / total_symbols for each symbol
-                        new_prob = probability * (1 / self.total_symbols)
-                        if new_prob >= self.probability_threshold:
-                            curr_round[next_state] += new_prob
-                
-                # Case 2: Only Larry remembers
-                if larry_only:
-                    # Each symbol in larry_only leads to a different state, so process all
-                    for symbol in larry_only:
-                        next_state = self.get_next_state(state, symbol)
-                        # Probability = 1 / total_symbols for each symbol
-                        new_prob = probability * (1 / self.total_symbols)
-                        if new_prob >= self.probability_threshold:
-                            curr_round[next_state] += new_prob
-                
-                # Case 3: Only Robin remembers
-                if robin_only:
-                    # Use the first symbol alphabetically for deterministic behavior
-                    symbol = sorted(robin_only)[0]
-                    next_state = self.get_next_state(state, symbol)
-                    # Probability = (number only in Robin's memory) / total_symbols
-                    new_prob = probability * (len(robin_only) / self.total_symbols)
+                for next_id, weight in table.successors(state_id):
+                    new_prob = probability * weight
                     if new_prob >= self.probability_threshold:
-                        curr_round[next_state] += new_prob
-                
-                # Case 4: Neither remembers
-                if neither_count > 0:
-                    # Use a representative new symbol (one that's not in either memory)
-                    used_symbols = larry_memory_set.union(robin_memory_set)
-                    available_symbols = set(self.symbols) - used_symbols
-                    
-                    if available_symbols:
-                        # Use the first symbol alphabetically for deterministic behavior
-                        symbol = sorted(available_symbols)[0]
-                        next_state = self.get_next_state(state, symbol)
-                        # Probability = (number in neither memory) / total_symbols
-                        new_prob = probability * (neither_count / self.total_symbols)
-                        if new_prob >= self.probability_threshold:
-                            curr_round[next_state] += new_prob
+                        curr_round[next_id] += new_prob
             
             print(f"  Processed {processed_states} states, pruned {pruned_states} low-probability states")
             prev_round = curr_round
         
+        final_states = {table[state_id]: probability for state_id, probability in prev_round.items()}
+        
         # Calculate expected score
         expected_score = 0.0
-        for state, probability in prev_round.items():
+        for state, probability in final_states.items():
             expected_score += state.score * probability
         
         print(f"DP solution completed in {time.time() - start_time:.2f} seconds")
-        return expected_score, prev_round
+        return expected_score, final_states
+    
+    def solve_packed(self, n_rounds: int) -> Tuple[float, Dict[SymbolicState, float]]:
+        """Same distribution as solve_dp, propagated by PackedStateEngine.
+        States are reported in canonical (relabelled) form."""
+        print(f"Solving with packed state propagation for {n_rounds} rounds...")
+        start_time = time.time()
+        
+        engine = PackedStateEngine(self, max_score=n_rounds)
+        dist = engine.propagate(n_rounds, self.probability_threshold)
+        print(f"  {len(engine.pairs)} canonical memory pairs, {len(engine.edge_src)} transitions")
+        
+        expected_score = engine.expected_score(dist)
+        print(f"Packed solution completed in {time.time() - start_time:.2f} seconds")
+        return expected_score, engine.to_state_dict(dist)
     
     def print_state_statistics(self, states_dict):
         """Print statistics about the states."""
@@ -273,13 +305,168 @@ class SymbolicSolver:
         
         print(f"\nTotal probability of top {min(top_n, len(sorted_states))} states: {total_prob_shown:.6f}")
 
+class PackedStateEngine:
+    """
+    Vectorized forward propagation for the memory game.
+
+    The memories only depend on which symbols were called, never on the
+    score, so the state splits into a memory pair and a (score, serving)
+    part.  Memory pairs are relabelled canonically (symbols numbered in order
+    of first appearance, Larry's memory first) and interned into ids; the
+    successors of each id are computed once.  A full state is packed as
+    pair_id * n_scores + 2 * (score + max_score) + larry_serving, and a round
+    is one sparse matrix product per symbol category.
+    """
+    BOTH, LARRY_ONLY, ROBIN_ONLY, NEITHER = range(4)
+
+    def __init__(self, solver: 'SymbolicSolver', max_score: int):
+        self.solver = solver
+        self.max_score = max_score
+        self.n_scores = 2 * (2 * max_score + 1)
+
+        self.pairs: List[Tuple[tuple, tuple]] = []
+        self.pair_ids: Dict[Tuple[tuple, tuple], int] = {}
+        # Successor table, one entry per (pair, symbol class)
+        self.edge_src: List[int] = []
+        self.edge_dst: List[int] = []
+        self.edge_weight: List[float] = []
+        self.edge_category: List[int] = []
+        self.expanded = 0
+
+        self.score_maps = [self._score_map(c) for c in range(4)]
+        self.intern((), ())
+
+    def intern(self, larry_memory: tuple, robin_memory: tuple) -> int:
+        """Id of the canonical form of a memory pair, allocating a new one if unseen."""
+        key = canonical_pair(larry_memory, robin_memory)
+        pair_id = self.pair_ids.get(key)
+        if pair_id is None:
+            pair_id = len(self.pairs)
+            self.pair_ids[key] = pair_id
+            self.pairs.append(key)
+        return pair_id
+
+    def pack(self, pair_id: int, score: int, larry_serving: bool) -> int:
+        return pair_id * self.n_scores + 2 * (score + self.max_score) + int(larry_serving)
+
+    def unpack(self, state_id: int) -> SymbolicState:
+        pair_id, column = divmod(state_id, self.n_scores)
+        larry, robin = self.pairs[pair_id]
+        symbols = self.solver.symbols
+        return SymbolicState(
+            larry_memory=tuple(symbols[x] for x in larry),
+            robin_memory=tuple(symbols[x] for x in robin),
+            score=column // 2 - self.max_score,
+            larry_serving=bool(column & 1)
+        )
+
+    def _score_map(self, category: int) -> np.ndarray:
+        """Column each (score, serving) column moves to for a call of this category."""
+        larry_remembers = category in (self.BOTH, self.LARRY_ONLY)
+        robin_remembers = category in (self.BOTH, self.ROBIN_ONLY)
+        target = np.zeros(self.n_scores, dtype=np.int64)
+        for column in range(self.n_scores):
+            score, serving = column // 2 - self.max_score, bool(column & 1)
+            new_score, new_serving = self.solver.next_score(
+                score, serving, larry_remembers, robin_remembers)
+            # Scores outside the window are unreachable within max_score rounds
+            new_score = max(-self.max_score, min(self.max_score, new_score))
+            target[column] = 2 * (new_score + self.max_score) + int(new_serving)
+        return target
+
+    def _expand(self, pair_id: int):
+        """Append the successors of one memory pair to the transition table."""
+        solver = self.solver
+        larry, robin = self.pairs[pair_id]
+        used = len(set(larry) | set(robin))
+        p = 1.0 / solver.total_symbols
+
+        # Every remembered symbol separately, plus one fresh symbol standing in
+        # for all the symbols neither player remembers
+        calls = [(symbol, p) for symbol in range(used)]
+        if used < solver.total_symbols:
+            calls.append((used, (solver.total_symbols - used) * p))
+
+        for symbol, weight in calls:
+            in_larry, in_robin = symbol in larry, symbol in robin
+            if in_larry and in_robin:
+                category = self.BOTH
+            elif in_larry:
+                category = self.LARRY_ONLY
+            elif in_robin:
+                category = self.ROBIN_ONLY
+            else:
+                category = self.NEITHER
+            dst = self.intern(solver.update_larry_memory(larry, symbol),
+                              solver.update_robin_memory(robin, symbol))
+            self.edge_src.append(pair_id)
+            self.edge_dst.append(dst)
+            self.edge_weight.append(weight)
+            self.edge_category.append(category)
+
+    def _transition_matrices(self, n_src: int):
+        """One (n_pairs x n_src) sparse matrix per category over the cached edges."""
+        src = np.array(self.edge_src, dtype=np.int64)
+        dst = np.array(self.edge_dst, dtype=np.int64)
+        weight = np.array(self.edge_weight)
+        category = np.array(self.edge_category)
+        shape = (len(self.pairs), n_src)
+        matrices = []
+        for c in range(4):
+            mask = category == c
+            matrices.append(sparse.csr_matrix((weight[mask], (dst[mask], src[mask])), shape=shape))
+        return matrices
+
+    def _column_matrices(self):
+        """Sparse 0/1 matrices applying each score map to the columns."""
+        columns = np.arange(self.n_scores)
+        ones = np.ones(self.n_scores)
+        return [sparse.csr_matrix((ones, (columns, target)), shape=(self.n_scores, self.n_scores))
+                for target in self.score_maps]
+
+    def propagate(self, n_rounds: int, threshold: float = 0.0) -> np.ndarray:
+        """
+        Distribution after n_rounds as a (n_pairs, n_scores) array.
+
+        Entries below threshold are dropped after every round.
+        """
+        dist = np.zeros((1, self.n_scores))
+        dist[0, self.pack(0, 0, True)] = 1.0
+        columns = self._column_matrices()
+        matrices = None
+
+        for round_num in range(n_rounds):
+            n_src = dist.shape[0]
+            while self.expanded < n_src:
+                self._expand(self.expanded)
+                self.expanded += 1
+            if matrices is None or matrices[0].shape != (len(self.pairs), n_src):
+                matrices = self._transition_matrices(n_src)
+
+            new_dist = np.zeros((len(self.pairs), self.n_scores))
+            for A, F in zip(matrices, columns):
+                new_dist += (A @ dist) @ F
+            if threshold > 0:
+                new_dist[new_dist < threshold] = 0.0
+            dist = new_dist
+        return dist
+
+    def expected_score(self, dist: np.ndarray) -> float:
+        scores = np.arange(self.n_scores) // 2 - self.max_score
+        return float(dist.sum(axis=0) @ scores)
+
+    def to_state_dict(self, dist: np.ndarray) -> Dict[SymbolicState, float]:
+        """Decode the non-zero entries back into SymbolicState keys."""
+        flat = dist.ravel()
+        return {self.unpack(int(i)): float(flat[i]) for i in np.nonzero(flat)[0]}
+
 # Main execution
 if __name__ == "__main__":
     # Create a solver with memory size 5 and 10 symbols
     solver = SymbolicSolver(memory_size=5, total_symbols=10)
-    rounds = 15
+    rounds = 50
     start_time = time.time()
-    expected_score, final_states = solver.solve_dp(rounds)
+    expected_score, final_states = solver.solve_packed(rounds)
     end_time = time.time()
     
     print(f"\nExpected score after {rounds} rounds: {expected_score:.8f}")